@@ -31,6 +31,9 @@ class Animator:
     def get_current_frame(self):
         return self.current_frame
 
+    def get_frames(self):
+        return [frame for animation in self.animations.values() if animation for frame in animation.frames]
+
     def add_animation(self, animation):
         self.animations[animation.id] = animation
 
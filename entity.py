@@ -3,6 +3,7 @@ import random
 from animation import *
 from game_component import *
 from managers import *
+from sprite_sheets import *
 
 
 class Entity(GameComponent):
@@ -31,7 +32,10 @@ class Entity(GameComponent):
         Returns whether the entity has reached the target block
 
     def get_drawing_bounds(self):
-        Returns the drawing bounds of the entity
+        Returns the drawing bounds of the entity on the maze
+
+    def get_surface_bounds(self):
+        Returns the bounds of the entity surface on the parent surface
     """
     speed = 5
     traversable_blocks = (MazeBlockType.PATH,)
@@ -79,15 +83,25 @@ class Entity(GameComponent):
         self.animator.update()
         super().update()
 
+    def draw(self):
+        # Move the surface over the drawing bounds of the entity on the maze
+        last_bounds = self.as_bounds
+        self.as_bounds = self.get_surface_bounds()
+        # The entity is drawn again every frame, so the parent has to draw where it was and where it is now
+        self.parent.mark_dirty(self.as_bounds.union(last_bounds))
+        super().draw()
+
     def on_scale(self, container_bounds):
         # Teleport to block target on scale
         self.location = self.block_target
-        # Copy bounds and surface from maze
-        self.as_bounds = self.parent.maze.as_bounds.copy()
-        self.bounds = self.parent.maze.bounds.copy()
-        self.surface = self.parent.maze.surface.copy()
         # Calculate size
         self.size = self.parent.maze.block_size * ENTITY_SIZE_FACTOR
+        # Copy bounds from maze, the surface only covers the entity and is moved over the maze as it is drawn
+        self.bounds = self.parent.maze.bounds.copy()
+        self.as_bounds = self.get_surface_bounds()
+        self.surface = create_surface(self.as_bounds.size())
+        # Scale every frame up front so drawing only blits
+        SpriteCache.prepare(self.animator.get_frames(), (self.size, self.size))
 
     def on_target_block(self):
         """
@@ -100,7 +114,7 @@ class Entity(GameComponent):
 
     def get_drawing_bounds(self):
         """
-        Returns the drawing bounds of the entity
+        Returns the drawing bounds of the entity on the maze
 
         Returns:
             Bounds: The drawing bounds of the entity
@@ -110,6 +124,18 @@ class Entity(GameComponent):
                       self.size,
                       self.size)
 
+    def get_surface_bounds(self):
+        """
+        Returns the bounds of the entity surface on the parent surface
+
+        Returns:
+            Bounds: The drawing bounds of the entity moved by the position of the maze
+        """
+        bounds = self.get_drawing_bounds()
+        bounds.x += self.parent.maze.as_bounds.x
+        bounds.y += self.parent.maze.as_bounds.y
+        return bounds
+
 
 class Pacman(Entity):
     """
@@ -138,12 +164,18 @@ class Pacman(Entity):
         self.ghost_point_value = INITIAL_GHOST_POINT_VALUE
 
         # Add pacman animations
-        self.animator.add_animation(
-            Animation("Moving", load_animation(PACMAN_MOVING_ANIMATION), PACMAN_ANIMATION_FRAME_RATE, True))
-        self.animator.add_animation(
-            Animation("Idle", load_animation(PACMAN_IDLE_ANIMATION), PACMAN_ANIMATION_FRAME_RATE, True))
-        self.animator.add_animation(
-            Animation("Death", load_animation(PACMAN_DEATH_ANIMATION), PACMAN_DEATH_ANIMATION_FRAME_RATE, False))
+        self.animator.add_animation(Animation("Moving", AssetRegistry.acquire_animation(PACMAN_MOVING_ANIMATION),
+                                              PACMAN_ANIMATION_FRAME_RATE, True))
+        self.animator.add_animation(Animation("Idle", AssetRegistry.acquire_animation(PACMAN_IDLE_ANIMATION),
+                                              PACMAN_ANIMATION_FRAME_RATE, True))
+        self.animator.add_animation(Animation("Death", AssetRegistry.acquire_animation(PACMAN_DEATH_ANIMATION),
+                                              PACMAN_DEATH_ANIMATION_FRAME_RATE, False))
+
+    @staticmethod
+    def preload():
+        AssetRegistry.preload_animation(PACMAN_MOVING_ANIMATION)
+        AssetRegistry.preload_animation(PACMAN_IDLE_ANIMATION)
+        AssetRegistry.preload_animation(PACMAN_DEATH_ANIMATION)
 
     def start(self):
         self.dead = False
@@ -155,7 +187,7 @@ class Pacman(Entity):
 
         # Choose a random spawn location
         spawn_location = Point(random.randrange(0, MAZE_WIDTH - 1), random.randrange(0, MAZE_HEIGHT - 1))
-        while self.parent.maze.point(spawn_location) != MazeBlockType.PATH or \
+        while self.parent.maze.block_type(spawn_location) != MazeBlockType.PATH or \
                 Point.distance(spawn_location, GHOST_CAGE_EXIT) < PACMAN_SPAWN_DISTANCE_THRESHOLD:
             spawn_location = Point(random.randrange(0, MAZE_WIDTH - 1), random.randrange(0, MAZE_HEIGHT - 1))
 
@@ -163,9 +195,16 @@ class Pacman(Entity):
         self.block_target = self.location
 
         # Remove point at the
-        self.parent.maze.point(self.location).pickup_consumed = True
+        self.parent.maze.consume_pickup(self.location)
         super().start()
 
+    def on_scale(self, container_bounds):
+        super().on_scale(container_bounds)
+        # Pacman is drawn facing each direction while alive
+        for animation_id in ("Moving", "Idle"):
+            SpriteCache.prepare(self.animator.animations.get(animation_id).frames, (self.size, self.size),
+                                (0, 90, 180, 270))
+
     def process_event(self, event):
 
         if event.type == pygame.KEYDOWN:
@@ -198,12 +237,12 @@ class Pacman(Entity):
         if self.on_target_block() and not self.dead:
             self.location = self.block_target  # Teleport to target block to get rid of minor differences
             # If the queued direction is possible
-            if self.parent.maze.point(self.location + self.next_direction) in self.traversable_blocks:
+            if self.parent.maze.block_type(self.location + self.next_direction) in self.traversable_blocks:
                 # Set the direction to the queued direction
                 self.direction = self.next_direction
 
             # If the current direction is possible
-            if self.parent.maze.point(self.location + self.direction) in self.traversable_blocks:
+            if self.parent.maze.block_type(self.location + self.direction) in self.traversable_blocks:
                 # Set the block target the next block in direction
                 self.block_target = self.location + self.direction
             # Otherwise
@@ -242,10 +281,10 @@ class Pacman(Entity):
                     TimedEventManager.add_timed_event(pygame.event.Event(FRUIT_SPAWN_READY), FRUIT_COOLDOWN_DURATION)
 
                 # Set the pickup consumed to true
-                block.pickup_consumed = True
+                self.parent.maze.consume_pickup(self.location)
 
             # If all the points are eaten
-            if globals.points_left <= 0:
+            if self.parent.maze.pickups.remaining <= 0:
                 # Post level finish event
                 pygame.event.post(pygame.event.Event(LEVEL_FINISH))
 
@@ -270,10 +309,10 @@ class Pacman(Entity):
     def draw(self):
         self.surface.fill(EMPTY)
         if self.dead:
-            image = self.animator.current_frame
+            rotation = 0
         else:
-            image = pygame.transform.rotate(self.animator.current_frame, self.face_direction.angular_position() - 90)
-        draw_image(self.surface, image, self.get_drawing_bounds())
+            rotation = self.face_direction.angular_position() - 90
+        self.surface.blit(SpriteCache.get(self.animator.current_frame, self.surface.get_size(), rotation), (0, 0))
         super().draw()
 
     def end(self):
@@ -286,6 +325,150 @@ class Pacman(Entity):
             globals.highscore = self.points
 
 
+class GhostCompositor:
+    """
+    Builds finished ghost sprites with the body and eyes drawn in, shared by every ghost
+
+    ...
+
+    Static Attributes:
+    ------------------
+    frightened_frames (list): The frightened animation frames, or None if not loaded yet
+    tinted_frames (dict): The normal animation frames tinted to each ghost color
+    size (float): The ghost size the sprites are built at
+    sprites (dict): The sprites keyed by body frame and eye direction
+
+    Static Methods:
+    ---------------
+    def get_normal_frames(color):
+        Returns the normal animation frames tinted to a ghost color
+
+    def get_frightened_frames():
+        Returns the frightened animation frames
+
+    def tint_frames(frames, color):
+        Returns copies of the normal animation frames tinted to a ghost color
+
+    def get_sprite(frame, direction, size):
+        Returns the finished sprite of a body frame and eye direction
+
+    def draw_eyes(surface, direction, size):
+        Draws the eyes looking in a direction on a ghost sized surface
+    """
+    frightened_frames = None
+    tinted_frames = {}
+    size = 0
+    sprites = {}
+
+    @staticmethod
+    def get_normal_frames(color):
+        """
+        Returns the normal animation frames tinted to a ghost color
+
+        The frames are loaded and tinted once per color, however many ghosts share it
+
+        Parameters:
+            color (tuple): The ghost color replacing the red of the frames
+
+        Returns:
+            list: The tinted frames
+        """
+        if color not in GhostCompositor.tinted_frames:
+            GhostCompositor.tinted_frames[color] = AssetRegistry.acquire_animation(
+                GHOST_NORMAL_ANIMATION, ("tint", color), lambda frames: GhostCompositor.tint_frames(frames, color))
+        return GhostCompositor.tinted_frames[color]
+
+    @staticmethod
+    def get_frightened_frames():
+        """
+        Returns the frightened animation frames
+
+        Returns:
+            list: The frightened frames
+        """
+        if GhostCompositor.frightened_frames is None:
+            GhostCompositor.frightened_frames = AssetRegistry.acquire_animation(GHOST_FRIGHTENED_ANIMATION)
+        return GhostCompositor.frightened_frames
+
+    @staticmethod
+    def tint_frames(frames, color):
+        """
+        Returns copies of the normal animation frames tinted to a ghost color
+
+        Parameters:
+            frames (list): The untinted normal animation frames
+            color (tuple): The ghost color replacing the red of the frames
+
+        Returns:
+            list: The tinted frames
+        """
+        tinted = []
+        for image in frames:
+            image = image.copy()
+            pixels = pygame.PixelArray(image)
+            pixels.replace(RED, color, 0.15)
+            del pixels
+            tinted.append(image)
+        return tinted
+
+    @staticmethod
+    def get_sprite(frame, direction, size):
+        """
+        Returns the finished sprite of a body frame and eye direction
+
+        The sprites of a size are built on first use and kept until the ghosts are scaled to another size
+
+        Parameters:
+            frame (Surface): The body frame, or None to only draw the eyes
+            direction (tuple): The x and y direction the eyes look in, or None to draw no eyes
+            size (float): The size of the ghost in pixels
+
+        Returns:
+            Surface: The sprite
+        """
+        if size != GhostCompositor.size:
+            GhostCompositor.size = size
+            GhostCompositor.sprites.clear()
+
+        key = (frame, direction)
+        sprite = GhostCompositor.sprites.get(key)
+        if sprite is None:
+            sprite = create_surface((int(size), int(size)))
+            if frame is not None:
+                SpriteCache.draw(sprite, frame, Bounds(0, 0, size, size))
+            if direction is not None:
+                GhostCompositor.draw_eyes(sprite, direction, size)
+            GhostCompositor.sprites[key] = sprite
+        return sprite
+
+    @staticmethod
+    def draw_eyes(surface, direction, size):
+        """
+        Draws the eyes looking in a direction on a ghost sized surface
+
+        Parameters:
+            surface (Surface): The surface to draw on
+            direction (tuple): The x and y direction the eyes look in
+            size (float): The size of the ghost in pixels
+        """
+        eye_separation = size * GHOST_EYE_SEPARATION_FACTOR
+        eye1_center = Point((size - eye_separation) / 2, int(size) * GHOST_EYE_VERTICAL_OFFSET_FACTOR)
+        eye2_center = Point((size + eye_separation) / 2, eye1_center.y)
+
+        pupil1_center = Point(eye1_center.x + direction[0] * size * GHOST_PUPIL_OFFSET_FACTOR[0],
+                              eye1_center.y + direction[1] * size * GHOST_PUPIL_OFFSET_FACTOR[1])
+        pupil2_center = Point(eye2_center.x + direction[0] * size * GHOST_PUPIL_OFFSET_FACTOR[0],
+                              eye2_center.y + direction[1] * size * GHOST_PUPIL_OFFSET_FACTOR[1])
+
+        draw_ellipse(surface, WHITE, eye1_center, GHOST_EYE_RADIUS_FACTOR[0] * size, GHOST_EYE_RADIUS_FACTOR[1] * size)
+        draw_ellipse(surface, WHITE, eye2_center, GHOST_EYE_RADIUS_FACTOR[0] * size, GHOST_EYE_RADIUS_FACTOR[1] * size)
+
+        pygame.draw.circle(surface, GHOST_PUPIL_COLOR, (pupil1_center.x, pupil1_center.y),
+                           size * GHOST_PUPIL_RADIUS_FACTOR)
+        pygame.draw.circle(surface, GHOST_PUPIL_COLOR, (pupil2_center.x, pupil2_center.y),
+                           size * GHOST_PUPIL_RADIUS_FACTOR)
+
+
 class Ghost(Entity):
     traversable_blocks = (MazeBlockType.PATH, MazeBlockType.EMPTY, MazeBlockType.BARRIER)
     speed = GHOST_SPEED
@@ -307,14 +490,10 @@ class Ghost(Entity):
                                    GhostAIState.FRIGHTENED: self.frightened_state,
                                    GhostAIState.EATEN: self.eaten_state}
 
-        animation = load_animation(GHOST_NORMAL_ANIMATION)
-        for image in animation:
-            pixels = pygame.PixelArray(image)
-            pixels.replace(RED, self.color, 0.15)
-            del pixels
-        self.animator.add_animation(Animation("Normal", animation, GHOST_ANIMATION_FRAME_RATE, True))
         self.animator.add_animation(
-            Animation("Frightened", load_animation(GHOST_FRIGHTENED_ANIMATION), GHOST_ANIMATION_FRAME_RATE, True))
+            Animation("Normal", GhostCompositor.get_normal_frames(self.color), GHOST_ANIMATION_FRAME_RATE, True))
+        self.animator.add_animation(
+            Animation("Frightened", GhostCompositor.get_frightened_frames(), GHOST_ANIMATION_FRAME_RATE, True))
 
     def start(self):
         self.location = self.spawn_point
@@ -389,36 +568,19 @@ class Ghost(Entity):
         super().update()
 
     def draw(self):
-        self.surface.fill(EMPTY)
-        ghost_bounds = self.get_drawing_bounds()
-        if self.current_state != GhostAIState.EATEN:
-            draw_image(self.surface, self.animator.get_current_frame(), ghost_bounds)
-
-        if self.current_state != GhostAIState.FRIGHTENED:
-            eye_separation = self.size * GHOST_EYE_SEPARATION_FACTOR
-            eye1_center = Point(ghost_bounds.x + (self.size - eye_separation) / 2,
-                                ghost_bounds.y + ghost_bounds.h * GHOST_EYE_VERTICAL_OFFSET_FACTOR)
-            eye2_center = Point(ghost_bounds.x + (self.size + eye_separation) / 2, eye1_center.y)
-
-            pupil1_center = Point(eye1_center.x + self.direction.x * self.size * GHOST_PUPIL_OFFSET_FACTOR[0],
-                                  eye1_center.y + self.direction.y * self.size * GHOST_PUPIL_OFFSET_FACTOR[1])
-            pupil2_center = Point(eye2_center.x + self.direction.x * self.size * GHOST_PUPIL_OFFSET_FACTOR[0],
-                                  eye2_center.y + self.direction.y * self.size * GHOST_PUPIL_OFFSET_FACTOR[1])
-
-            draw_ellipse(self.surface, WHITE, eye1_center, GHOST_EYE_RADIUS_FACTOR[0] * self.size,
-                         GHOST_EYE_RADIUS_FACTOR[1] * self.size)
-            draw_ellipse(self.surface, WHITE, eye2_center, GHOST_EYE_RADIUS_FACTOR[0] * self.size,
-                         GHOST_EYE_RADIUS_FACTOR[1] * self.size)
-
-            pygame.draw.circle(self.surface, GHOST_PUPIL_COLOR, (pupil1_center.x, pupil1_center.y),
-                               self.size * GHOST_PUPIL_RADIUS_FACTOR)
-            pygame.draw.circle(self.surface, GHOST_PUPIL_COLOR, (pupil2_center.x, pupil2_center.y),
-                               self.size * GHOST_PUPIL_RADIUS_FACTOR)
+        # The finished sprite is shared with the other ghosts and becomes the surface the parent draws
+        frame = None if self.current_state == GhostAIState.EATEN else self.animator.get_current_frame()
+        direction = None if self.current_state == GhostAIState.FRIGHTENED else (self.direction.x, self.direction.y)
+        self.surface = GhostCompositor.get_sprite(frame, direction, self.size)
 
         if DISPLAY_GHOST_TARGET:
-            pygame.draw.circle(self.surface, self.color,
-                               (self.target_location.x * self.parent.maze.block_size + self.parent.maze.block_size // 2,
-                                self.target_location.y * self.parent.maze.block_size + self.parent.maze.block_size // 2),
+            # The target can be anywhere on the maze so draw it straight onto the parent surface
+            maze_bounds = self.parent.maze.as_bounds
+            pygame.draw.circle(self.parent.surface, self.color,
+                               (maze_bounds.x + self.target_location.x * self.parent.maze.block_size +
+                                self.parent.maze.block_size // 2,
+                                maze_bounds.y + self.target_location.y * self.parent.maze.block_size +
+                                self.parent.maze.block_size // 2),
                                self.parent.maze.block_size // 3)
         super().draw()
 
@@ -493,7 +655,7 @@ class Ghost(Entity):
             traversable_blocks = (MazeBlockType.PATH,)
 
         for direction in possible_directions:
-            if self.parent.maze.point(Point.rounded(self.location + direction)) in traversable_blocks:
+            if self.parent.maze.block_type(Point.rounded(self.location + direction)) in traversable_blocks:
                 valid_directions.append(direction)
 
         del possible_directions
@@ -527,7 +689,7 @@ class Ghost(Entity):
             open_nodes.remove(current_node)
             closed_nodes.append(current_node)
             for node in current_node.neighbours():
-                if node not in closed_nodes and self.parent.maze.point(node.location) in self.traversable_blocks:
+                if node not in closed_nodes and self.parent.maze.block_type(node.location) in self.traversable_blocks:
                     if node not in open_nodes:
                         node.calculate_h(target)
                         node.calculate_f()
@@ -15,9 +15,11 @@ class GameComponent:
     aspect_ratio (float): The maintained surface aspect ratio of this game component
     as_bounds (Bounds): The bounds of this game component surface with the locked aspect ratio
     surface (Surface): The main drawing surface of this game component
+    opaque (bool): Whether the game component covers its whole surface, so the surface needs no alpha channel
     enabled (bool): Whether this game component is enabled or disabled
     paused (bool): Whether this game component is paused
     child_game_components (list): A list of child game components
+    dirty_rects (list): The areas of the surface changed since the parent last drew them
 
     Methods:
     --------
@@ -33,6 +35,15 @@ class GameComponent:
     def draw(self):
         Draws onto the game component surface
 
+    def draw_background(self, rect):
+        Clears an area of the surface before the children are drawn over it
+
+    def mark_dirty(self, rect=None):
+        Marks an area of the surface as changed
+
+    def take_dirty_rects(self):
+        Returns the areas of the surface changed since the last call and clears them
+
     def on_scale(self, container_bounds):
         Scales the game component bounds and surface
 
@@ -68,10 +79,12 @@ class GameComponent:
         self.bounds = Bounds(0, 0, 500, 500)
         self.aspect_ratio = None
         self.as_bounds = None
-        self.surface = pygame.Surface(self.bounds.size(), flags=pygame.SRCALPHA)
+        self.opaque = False
+        self.surface = create_surface(self.bounds.size())
         self.enabled = True
         self.paused = False
         self.child_game_components = []
+        self.dirty_rects = []
 
     def __str__(self):
         """
@@ -123,18 +136,71 @@ class GameComponent:
     def draw(self):
         """
         Draws onto the game component surface
+
+        Only the areas the children changed are drawn again, every other area of the surface is kept from the last draw
         """
-        # Call draw on all children if enabled and draw their surface onto the game component surface
+        if not self.child_game_components:
+            return
+        if DISPLAY_BOUND_BORDER:
+            self.mark_dirty()
+
+        # Call draw on all children if enabled and collect the areas they changed
         for component in self.child_game_components:
             if component.enabled:
                 component.draw()
-                self.surface.blit(component.surface, component.as_bounds.position())
-
-                if DISPLAY_BOUND_BORDER:
-                    # Display children bounds and aspect ratio bounds
+                x, y = component.as_bounds.position()
+                self.dirty_rects += [rect.move(x, y) for rect in component.take_dirty_rects()]
+
+        # Draw the surface of every child over the changed areas
+        for rect in self.dirty_rects:
+            self.draw_background(rect)
+            for component in self.child_game_components:
+                if component.enabled:
+                    area = rect.clip(component.as_bounds)
+                    if area:
+                        self.surface.blit(component.surface, area,
+                                          area.move(-component.as_bounds.x, -component.as_bounds.y))
+
+        if DISPLAY_BOUND_BORDER:
+            # Display children bounds and aspect ratio bounds
+            for component in self.child_game_components:
+                if component.enabled:
                     pygame.draw.rect(self.surface, RED, component.bounds, 2)
                     pygame.draw.rect(self.surface, YELLOW, component.as_bounds, 2)
 
+    def draw_background(self, rect):
+        """
+        Clears an area of the surface before the children are drawn over it
+
+        Parameters:
+            rect (Rect): The area to clear
+        """
+        self.surface.fill(EMPTY, rect)
+
+    def mark_dirty(self, rect=None):
+        """
+        Marks an area of the surface as changed
+
+        Parameters:
+            rect (Rect): The changed area (Default: the whole surface)
+        """
+        if rect is None:
+            # The whole surface covers any area already marked
+            self.dirty_rects = [self.surface.get_rect()]
+        else:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def take_dirty_rects(self):
+        """
+        Returns the areas of the surface changed since the last call and clears them
+
+        Returns:
+            list: The changed areas
+        """
+        dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+        return dirty_rects
+
     def on_scale(self, container_bounds):
         """
         Scales the game component bounds and surface
@@ -159,7 +225,8 @@ class GameComponent:
                 self.as_bounds.y += (self.bounds.height - self.as_bounds.height) / 2
 
         # Create new scaled surface
-        self.surface = pygame.Surface(self.as_bounds.size(), flags=pygame.SRCALPHA)
+        self.surface = create_surface(self.as_bounds.size(), not self.opaque)
+        self.mark_dirty()
 
         # Scale all children with the calculated game component bounds
         for component in self.child_game_components:
@@ -176,6 +243,12 @@ class GameComponent:
         """
         Sets the game component and all children to a new enable state
         """
+        if state != self.enabled:
+            # The area the component covers on the parent surface has to be drawn again
+            if self.parent is not None and self.as_bounds is not None:
+                self.parent.mark_dirty(self.as_bounds)
+            if state:
+                self.mark_dirty()
         self.enabled = state
         self.set_children_enable(state)
 
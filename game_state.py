@@ -1,6 +1,7 @@
 from entity import *
 from managers import *
 from maze import *
+from sprite_sheets import *
 from ui_elements import *
 
 
@@ -8,21 +9,26 @@ class StartMenu(GameComponent):
 
     def __init__(self, parent, scale):
         super().__init__(parent, scale)
+        self.opaque = True
 
-        self.title_logo = Icon(self, BoundScale(0.5, 0.2, 0.7, 0.2), pygame.image.load(os.path.join(ICON_FILE_PATH, START_MENU_TITLE_LOGO)))
+        self.title_logo = Icon(self, BoundScale(0.5, 0.2, 0.7, 0.2),
+                               AssetRegistry.acquire_image(os.path.join(ICON_FILE_PATH, START_MENU_TITLE_LOGO)))
         self.child_game_components.append(self.title_logo)
 
         self.start_button = Button(self, BoundScale(0.55, 0.55, 0.4, 0.1),
-                                   Animation(ButtonState.NORMAL, load_animation(START_BUTTON_NORMAL_ANIMATION), 15, True),
-                                   Animation(ButtonState.HOVER, load_animation(START_BUTTON_HOVER_ANIMATION), 15, True),
+                                   Animation(ButtonState.NORMAL,
+                                             AssetRegistry.acquire_animation(START_BUTTON_NORMAL_ANIMATION), 15, True),
+                                   Animation(ButtonState.HOVER,
+                                             AssetRegistry.acquire_animation(START_BUTTON_HOVER_ANIMATION), 15, True),
                                    func=self.start_game)
 
         self.child_game_components.append(self.start_button)
 
         self.quit_button = Button(self, BoundScale(0.55, 0.65, 0.4, 0.1),
-                                   Animation(ButtonState.NORMAL, load_animation(QUIT_BUTTON_NORMAL_ANIMATION), 15,
-                                             True),
-                                   Animation(ButtonState.HOVER, load_animation(QUIT_BUTTON_HOVER_ANIMATION), 15, True),
+                                   Animation(ButtonState.NORMAL,
+                                             AssetRegistry.acquire_animation(QUIT_BUTTON_NORMAL_ANIMATION), 15, True),
+                                   Animation(ButtonState.HOVER,
+                                             AssetRegistry.acquire_animation(QUIT_BUTTON_HOVER_ANIMATION), 15, True),
                                    func=self.quit_game)
 
         self.child_game_components.append(self.quit_button)
@@ -35,9 +41,8 @@ class StartMenu(GameComponent):
     def quit_game():
         pygame.event.post(pygame.event.Event(pygame.QUIT))
 
-    def draw(self):
-        self.surface.fill(BLACK)
-        super().draw()
+    def draw_background(self, rect):
+        self.surface.fill(BLACK, rect)
 
 
 class SettingMenu(GameComponent):
@@ -50,6 +55,7 @@ class GameMenu(GameComponent):
 
     def __init__(self, parent, scale):
         super().__init__(parent, scale)
+        self.opaque = True
 
         maze_scale = BoundScale(0.5, 0.54, 0.95, 0.87)
 
@@ -73,7 +79,8 @@ class GameMenu(GameComponent):
         self.child_game_components.append(self.highscore_text)
 
         self.life_bar = IconBar(self, BoundScale(0.86, 0.05, 0.15, 0.04),
-                                pygame.image.load(os.path.join(ICON_FILE_PATH, PACMAN_LIFE_ICON_IMAGE)), PACMAN_LIVES)
+                                AssetRegistry.acquire_image(os.path.join(ICON_FILE_PATH, PACMAN_LIFE_ICON_IMAGE)),
+                                PACMAN_LIVES)
         self.child_game_components.append(self.life_bar)
 
         self.game_over_text = Text(self, BoundScale(0.5, 0.6, 0.3, 0.1), "GAME OVER", RED, FONT_NAME, 200, True)
@@ -82,13 +89,14 @@ class GameMenu(GameComponent):
         self.frightened_mode = False
         self.current_bg_sound = None
         self.play_bg_sound = False
+        self.shown_points = None
+        self.shown_highscore = None
 
     def start(self):
         self.set_enable(True)
         self.game_over_text.set_enable(False)
 
         self.game_start()
-        globals.points_left = 0
         super().start()
 
     def process_event(self, event):
@@ -129,14 +137,28 @@ class GameMenu(GameComponent):
         else:
             self.set_background_sound(None)
 
-        self.score_text.set_text(add_text_digit_padding(str(self.pacman.points), DEFAULT_POINTS_DIGITS))
-        self.highscore_text.set_text(add_text_digit_padding(str(globals.highscore), DEFAULT_POINTS_DIGITS))
+        if self.pacman.points != self.shown_points:
+            self.shown_points = self.pacman.points
+            self.score_text.set_text(add_text_digit_padding(str(self.shown_points), DEFAULT_POINTS_DIGITS))
+        if globals.highscore != self.shown_highscore:
+            self.shown_highscore = globals.highscore
+            self.highscore_text.set_text(add_text_digit_padding(str(self.shown_highscore), DEFAULT_POINTS_DIGITS))
         self.life_bar.set_current_num(self.pacman.lives)
         super().update()
 
-    def draw(self):
-        self.surface.fill(BLACK)
-        super().draw()
+    def draw_background(self, rect):
+        self.surface.fill(BLACK, rect)
+
+    @staticmethod
+    def preload():
+        # Load what the game menu needs on the preload thread so it can be built without waiting on the disk
+        GlyphAtlas.get_font(FONT_NAME, 200)
+        Maze.preload()
+        Pacman.preload()
+        for ghost in (Blinky, Pinky, Inky, Clyde):
+            GhostCompositor.get_normal_frames(ghost.color)
+        GhostCompositor.get_frightened_frames()
+        AssetRegistry.preload_image(os.path.join(ICON_FILE_PATH, PACMAN_LIFE_ICON_IMAGE))
 
     def set_background_sound(self, sound):
         if sound == self.current_bg_sound:
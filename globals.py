@@ -3,14 +3,11 @@ game = None
 size = (0, 0)
 
 maze_wall_images = {}
-scaled_maze_wall_images = {}
 maze_barrier_image = None
-scaled_maze_barrier_image = None
 
 fruit_image = None
 scaled_fruit_image = None
 
 highscore = 0
-points_left = 0
 fruit_spawnable = True
 ghosts_eaten = 0
\ No newline at end of file
@@ -5,16 +5,11 @@ from managers import *
 from pacman_game import *
 from settings import *
 
-pygame.init()
-pygame.mixer.init()
-SoundManager.init()
-
-globals.size = START_SIZE
-screen = pygame.display.set_mode(globals.size, pygame.RESIZABLE)
-clock = pygame.time.Clock()
+clock = None
 running = True
-
-globals.game = Pacman_Game(None, BoundScale(0.5, 0.5, 1, 1), Bounds(0, 0, globals.size[0], globals.size[1]))
+# The latest size the window was resized to and when, while waiting for the resizing to stop
+resize_size = None
+resize_time = 0
 
 
 def run():
@@ -23,46 +18,88 @@ def run():
             process_default_event(event)
             globals.game.process_event(event)
 
+        settle_resize()
+
         globals.game.update()
         TimedEventManager.update()
         SoundManager.update()
         globals.game.draw()
-        screen.blit(globals.game.surface, globals.game.bounds.position())
-        pygame.display.flip()
-        pygame.display.update()
+        if resize_size is None:
+            # Only copy and update the areas of the screen that changed
+            Display.present(globals.game.surface, globals.game.take_dirty_rects())
+        else:
+            # Stretch the frame over the window until the window stops changing size
+            globals.game.take_dirty_rects()
+            Display.present_stretched(globals.game.surface)
 
         globals.delta_time = clock.tick_busy_loop(FPS) / 1000.0
 
     # Exit the program
     globals.game.end()
+    if PRINT_ASSET_MEMORY_REPORT:
+        AssetRegistry.print_memory_report()
     pygame.quit()
     sys.exit()
 
 
 def process_default_event(event):
     global running
-    global screen
+    global resize_size
+    global resize_time
 
     if event.type == pygame.QUIT:
         running = False
     if event.type == pygame.VIDEORESIZE:
-        new_size = list(event.dict['size'])
+        # Only keep the latest size, laying the game out once the window has settled on it
+        if tuple(event.dict['size']) == globals.size:
+            resize_size = None
+            if Display.stretch_size is not None:
+                # Present the whole frame again over the stretched one, borders included
+                Display.set_mode(globals.size)
+                globals.game.mark_dirty()
+        else:
+            resize_size = tuple(event.dict['size'])
+            resize_time = pygame.time.get_ticks()
 
-        if new_size[0] < MIN_SIZE[0]:
-            new_size[0] = MIN_SIZE[0]
-        if new_size[1] < MIN_SIZE[1]:
-            new_size[1] = MIN_SIZE[1]
 
-        size_change = (abs(new_size[0] - globals.size[0]), abs(new_size[1] - globals.size[1]))
-        if size_change[0] > size_change[1]:
-            new_size[1] = int(new_size[0] // ASPECT_RATIO)
-        else:
-            new_size[0] = int(new_size[1] * ASPECT_RATIO)
+def settle_resize():
+    global resize_size
 
-        globals.size = tuple(new_size)
-        screen = pygame.display.set_mode(globals.size, pygame.RESIZABLE)
+    if resize_size is None or pygame.time.get_ticks() - resize_time < RESIZE_SETTLE_TIME * 1000:
+        return
+
+    new_size = list(resize_size)
+    resize_size = None
+
+    if new_size[0] < MIN_SIZE[0]:
+        new_size[0] = MIN_SIZE[0]
+    if new_size[1] < MIN_SIZE[1]:
+        new_size[1] = MIN_SIZE[1]
+
+    size_change = (abs(new_size[0] - globals.size[0]), abs(new_size[1] - globals.size[1]))
+    if size_change[0] > size_change[1]:
+        new_size[1] = int(new_size[0] // ASPECT_RATIO)
+    else:
+        new_size[0] = int(new_size[1] * ASPECT_RATIO)
+
+    globals.size = tuple(new_size)
+    Display.set_mode(globals.size)
+    if INTERNAL_RESOLUTION:
+        # The fixed frame keeps its layout, so it only needs presenting again at the new scale
+        globals.game.mark_dirty()
+    else:
         globals.game.on_scale(Bounds(0, 0, globals.size[0], globals.size[1]))
 
 
+# Only set up the game in the main process, as the maze prefetcher's spawned worker imports this module too
 if __name__ == '__main__':
+    pygame.init()
+    pygame.mixer.init()
+
+    globals.size = START_SIZE
+    Display.set_mode(globals.size)
+    clock = pygame.time.Clock()
+
+    frame_size = Display.frame_size(globals.size)
+    globals.game = Pacman_Game(None, BoundScale(0.5, 0.5, 1, 1), Bounds(0, 0, frame_size[0], frame_size[1]))
     run()
@@ -1,6 +1,10 @@
+import threading
+from collections import OrderedDict
+
 import globals
 from settings import *
 from enum_types import *
+from sprite_sheets import *
 
 
 class TimedEventManager:
@@ -41,14 +45,274 @@ class TimedEvent:
             TimedEventManager.remove_timed_event(self)
 
 
+class SpriteCache:
+    # The scaled sprites of each size keyed by their source image and rotation, least recently used size first
+    sizes = OrderedDict()
+    memory = 0
+    # Held while the sprites change, as the asset registry discards sprites on the preload thread
+    lock = threading.RLock()
+
+    @staticmethod
+    def get(image, size, rotation=0):
+        size = (int(size[0]), int(size[1]))
+        rotation %= 360
+
+        with SpriteCache.lock:
+            sprites = SpriteCache.sizes.get(size)
+            if sprites is None:
+                sprites = {}
+                SpriteCache.sizes[size] = sprites
+            else:
+                SpriteCache.sizes.move_to_end(size)
+
+            key = (image, rotation)
+            sprite = sprites.get(key)
+            if sprite is None:
+                # Rotate before scaling as the sprites have always been scaled from the rotated images
+                if rotation:
+                    image = pygame.transform.rotate(image, rotation)
+                sprite = pygame.transform.smoothscale(image, size)
+                sprites[key] = sprite
+                SpriteCache.memory += SpriteCache.sprite_memory(sprite)
+                SpriteCache.evict()
+            return sprite
+
+    @staticmethod
+    def prepare(images, size, rotations=(0,)):
+        for image in images:
+            for rotation in rotations:
+                SpriteCache.get(image, size, rotation)
+
+    @staticmethod
+    def draw(surface, image, bounds, rotation=0):
+        surface.blit(SpriteCache.get(image, bounds.size(), rotation), bounds.position())
+
+    @staticmethod
+    def evict():
+        # Drop the sizes used least recently until the sprites fit in memory, always keeping the size last used
+        with SpriteCache.lock:
+            while SpriteCache.memory > SPRITE_CACHE_MAX_BYTES and len(SpriteCache.sizes) > 1:
+                size, sprites = SpriteCache.sizes.popitem(last=False)
+                SpriteCache.memory -= sum(SpriteCache.sprite_memory(sprite) for sprite in sprites.values())
+
+    @staticmethod
+    def discard(images):
+        images = set(images)
+        with SpriteCache.lock:
+            for sprites in SpriteCache.sizes.values():
+                for key in [key for key in sprites if key[0] in images]:
+                    SpriteCache.memory -= SpriteCache.sprite_memory(sprites.pop(key))
+
+    @staticmethod
+    def sprite_memory(sprite):
+        return sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+
+
+class AssetRegistry:
+    # The surfaces and reference count of each asset id and transform, least recently released first
+    assets = OrderedDict()
+    # The asset id and transform each loaded surface belongs to
+    owners = {}
+    memory = 0
+    # The asset id and transform of each preloaded asset whose reference is waiting for its first acquire
+    preloaded = set()
+    # Held while the assets change, as they are also loaded on the preload thread
+    lock = threading.RLock()
+
+    @staticmethod
+    def acquire_image(path, transform=None, build=None):
+        return AssetRegistry.acquire(path, transform, lambda: [load_image(path)], build)[0]
+
+    @staticmethod
+    def acquire_animation(animation_path, transform=None, build=None):
+        return AssetRegistry.acquire(animation_path, transform, lambda: load_animation(animation_path), build)
+
+    @staticmethod
+    def acquire(asset_id, transform, load, build=None):
+        key = (asset_id, transform)
+        with AssetRegistry.lock:
+            entry = AssetRegistry.assets.get(key)
+            if entry is None:
+                if transform is None:
+                    surfaces = load()
+                else:
+                    # Variants are built from the untransformed asset, which is kept while the memory budget allows
+                    if build is None:
+                        raise ValueError("No way to build the " + str(transform) + " variant of " + str(asset_id))
+                    surfaces = build(AssetRegistry.acquire(asset_id, None, load))
+                    AssetRegistry.release(asset_id)
+
+                entry = [surfaces, 0]
+                AssetRegistry.assets[key] = entry
+                for surface in surfaces:
+                    AssetRegistry.owners[surface] = key
+                AssetRegistry.memory += AssetRegistry.surfaces_memory(surfaces)
+            # The first acquire of a preloaded asset takes over the reference the preload held
+            if key in AssetRegistry.preloaded:
+                AssetRegistry.preloaded.remove(key)
+            else:
+                entry[1] += 1
+            return entry[0]
+
+    @staticmethod
+    def release(asset_id, transform=None):
+        key = (asset_id, transform)
+        with AssetRegistry.lock:
+            entry = AssetRegistry.assets[key]
+            entry[1] -= 1
+            if entry[1] <= 0:
+                AssetRegistry.assets.move_to_end(key)
+                AssetRegistry.evict()
+
+    @staticmethod
+    def preload_image(path):
+        AssetRegistry.preload(path, lambda: [load_image(path)])
+
+    @staticmethod
+    def preload_animation(animation_path):
+        AssetRegistry.preload(animation_path, lambda: load_animation(animation_path))
+
+    @staticmethod
+    def preload(asset_id, load):
+        # Load the asset ahead of time, holding a reference so it can't be evicted before the state needing it is built
+        key = (asset_id, None)
+        with AssetRegistry.lock:
+            if key not in AssetRegistry.preloaded:
+                AssetRegistry.acquire(asset_id, None, load)
+                AssetRegistry.preloaded.add(key)
+
+    @staticmethod
+    def evict():
+        # Drop the assets no longer in use until the assets fit in memory, along with their scaled sprites
+        for key in [key for key, entry in AssetRegistry.assets.items() if entry[1] <= 0]:
+            if AssetRegistry.memory <= ASSET_CACHE_MAX_BYTES:
+                break
+            surfaces = AssetRegistry.assets.pop(key)[0]
+            for surface in surfaces:
+                del AssetRegistry.owners[surface]
+            AssetRegistry.memory -= AssetRegistry.surfaces_memory(surfaces)
+            SpriteCache.discard(surfaces)
+
+    @staticmethod
+    def surfaces_memory(surfaces):
+        # Frames cut from the same sprite sheet share its pixels
+        return sum(SpriteCache.sprite_memory(parent) for parent in {surface.get_abs_parent() for surface in surfaces})
+
+    @staticmethod
+    def memory_report():
+        sprite_memory = {}
+        with AssetRegistry.lock, SpriteCache.lock:
+            for sprites in SpriteCache.sizes.values():
+                for (image, rotation), sprite in sprites.items():
+                    key = AssetRegistry.owners.get(image)
+                    sprite_memory[key] = sprite_memory.get(key, 0) + SpriteCache.sprite_memory(sprite)
+
+            report = [(asset_id, transform, entry[1], AssetRegistry.surfaces_memory(entry[0]),
+                       sprite_memory.get((asset_id, transform), 0))
+                      for (asset_id, transform), entry in AssetRegistry.assets.items()]
+        report.sort(key=lambda row: row[3] + row[4], reverse=True)
+        return report
+
+    @staticmethod
+    def print_memory_report():
+        print("refs  loaded KiB  scaled KiB  asset")
+        for asset_id, transform, refs, loaded, scaled in AssetRegistry.memory_report():
+            name = str(asset_id) if transform is None else str(asset_id) + " " + str(transform)
+            print(str(refs).rjust(4) + str(round(loaded / 1024)).rjust(12) + str(round(scaled / 1024)).rjust(12) +
+                  "  " + name)
+        print("Total loaded " + str(round(AssetRegistry.memory / 1024)) + "KiB, scaled " +
+              str(round(SpriteCache.memory / 1024)) + "KiB")
+
+
+class Display:
+    screen = None
+    # The area of the window the fixed frame is scaled to, or None when rendering at the window size
+    frame_area = None
+    frame_scale = 1
+    frame_smooth = False
+    # The size of the frame stretched over the whole window while it is resized, or None when presenting normally
+    stretch_size = None
+
+    @staticmethod
+    def set_mode(size):
+        Display.screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        Display.stretch_size = None
+        if not INTERNAL_RESOLUTION:
+            return
+
+        scale = min(size[0] / INTERNAL_RESOLUTION[0], size[1] / INTERNAL_RESOLUTION[1])
+        # Scale by whole numbers unless asked not to or the window is too small to fit the frame
+        Display.frame_smooth = INTERNAL_RESOLUTION_SMOOTH or scale < 1
+        Display.frame_scale = scale if Display.frame_smooth else int(scale)
+        frame_size = (int(INTERNAL_RESOLUTION[0] * Display.frame_scale),
+                      int(INTERNAL_RESOLUTION[1] * Display.frame_scale))
+        # Centre the frame, leaving the rest of the window black
+        Display.frame_area = pygame.Rect(((size[0] - frame_size[0]) // 2, (size[1] - frame_size[1]) // 2), frame_size)
+
+    @staticmethod
+    def frame_size(window_size):
+        return INTERNAL_RESOLUTION if INTERNAL_RESOLUTION else window_size
+
+    @staticmethod
+    def present(surface, dirty_rects):
+        if not dirty_rects:
+            return
+
+        if Display.frame_area is None:
+            for rect in dirty_rects:
+                Display.screen.blit(surface, rect, rect)
+            pygame.display.update(dirty_rects)
+        elif Display.frame_smooth:
+            # Smooth scaling blends neighbouring pixels, so the whole frame is scaled at once
+            pygame.transform.smoothscale(surface, Display.frame_area.size, Display.screen.subsurface(Display.frame_area))
+            pygame.display.update(Display.frame_area)
+        else:
+            # Each changed area of the frame maps to a whole number of window pixels, so only those are scaled
+            scale = Display.frame_scale
+            window_rects = []
+            for rect in dirty_rects:
+                # Subsurfaces must lie inside the frame, which blits would otherwise clip to
+                rect = rect.clip(surface.get_rect())
+                if not rect:
+                    continue
+                window_rect = pygame.Rect(Display.frame_area.x + rect.x * scale, Display.frame_area.y + rect.y * scale,
+                                          rect.width * scale, rect.height * scale)
+                pygame.transform.scale(surface.subsurface(rect), window_rect.size,
+                                       Display.screen.subsurface(window_rect))
+                window_rects.append(window_rect)
+            pygame.display.update(window_rects)
+
+    @staticmethod
+    def present_stretched(surface):
+        # The window surface is resized along with the window, so take it again
+        Display.screen = pygame.display.get_surface()
+        Display.stretch_size = surface.get_size()
+        pygame.transform.scale(surface, Display.screen.get_size(), Display.screen)
+        pygame.display.flip()
+
+    @staticmethod
+    def mouse_position():
+        x, y = pygame.mouse.get_pos()
+        if Display.stretch_size is not None:
+            width, height = Display.screen.get_size()
+            return x * Display.stretch_size[0] / width, y * Display.stretch_size[1] / height
+        if Display.frame_area is None:
+            return x, y
+        return ((x - Display.frame_area.x) * INTERNAL_RESOLUTION[0] / Display.frame_area.width,
+                (y - Display.frame_area.y) * INTERNAL_RESOLUTION[1] / Display.frame_area.height)
+
+
 class SoundManager:
     sounds = {}
 
     @staticmethod
     def init():
+        # Decode every sound before replacing the sounds, as this runs on the preload thread while the game updates
+        sounds = {}
         for sound, file_name in SOUND_FILES.items():
-            SoundManager.sounds[sound] = Sound(pygame.mixer.Sound(os.path.join(SOUND_FILE_PATH, file_name)))
-            SoundManager.sounds.get(sound).sound.set_volume(SOUND_VOLUME.get(sound))
+            sounds[sound] = Sound(pygame.mixer.Sound(os.path.join(SOUND_FILE_PATH, file_name)))
+            sounds.get(sound).sound.set_volume(SOUND_VOLUME.get(sound))
+        SoundManager.sounds = sounds
 
     @staticmethod
     def update():
@@ -1,9 +1,15 @@
-import pickle
 import random
-from copy import deepcopy
 
 from game_component import *
 from managers import *
+from maze_atlas import *
+from maze_corpus import *
+from maze_grid import *
+from maze_pickups import *
+from maze_prefetcher import *
+from maze_presets import *
+from maze_tiler import *
+from maze_validation import *
 
 
 class Maze(GameComponent):
@@ -12,81 +18,137 @@ class Maze(GameComponent):
 
     Attributes:
     -----------
-    maze (list): The 2 dimensional list of blocks making up the maze
+    maze (MazeGrid): The grid of blocks making up the maze
     block_size (int): The size of the blocks in pixels
     wall_surface (Surface): The surface the walls are drawn on
-    n (int): List iterator counter
+    pickup_surface (Surface): The transparent surface the pickups left are drawn on
+    pickups (PickupIndex): The count of the pickups left in the maze and the blocks a fruit can spawn on
+    corpus (MazeCorpus): The corpus levels are loaded from while the maze is started, or None
+    prefetcher (MazePrefetcher): The prefetcher building the mazes of the next levels, or None if using a corpus
+    level (int): The number of the next level to start
+    level_finished (bool): Whether the current level has finished and the next one is being prepared
+    next_maze (MazeGrid): The maze of the next level, or None if it has not been taken yet
+    next_wall_surface (Surface): The surface the walls of the next maze are being drawn on
+    next_wall_row (int): The number of rows of walls of the next maze drawn so far
+
+    Static Attributes:
+    ------------------
+    preloaded_prefetcher (MazePrefetcher): The prefetcher started by preload for the next maze created, or None
 
     Methods:
     --------
     def point(self, point):
         Returns the block at the point
 
+    def block_type(self, point):
+        Returns the type of the block at the point
+
     def draw_walls(self):
         Draws the walls on the wall surface
 
-    def generate_maze(self):
+    def draw_wall_rows(self, grid, surface, start_row, end_row):
+        Draws the walls of a range of rows of a maze grid on a surface
+
+    def draw_pickups(self):
+        Draws every pickup left on the pickup surface
+
+    def redraw_pickup(self, block):
+        Redraws the tile of a path block on the pickup surface
+
+    def consume_pickup(self, point):
+        Consumes the pickup at the point and erases it from the pickup surface
+
+    def spawn_fruit(self):
+        Puts a fruit on a random block whose pickup has been consumed
+
+    def next_level_maze(self, block=True):
+        Returns the maze of the next level
+
+    def prerender_next_level(self):
+        Takes the maze of the next level and draws a few more rows of its walls
+
+    def generate_maze(self, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
         Generates and returns a pac-man maze
 
+    def open_corpus(self):
+        Opens the corpus the levels are loaded from
+
+    def load_maze(self, level):
+        Returns the maze of a level from the corpus
+
     Static Methods:
     ---------------
-    def generate_pieces(width, height):
-        Generates and returns maze pieces that fit together
+    def preload():
+        Loads the maze images and starts building the first level before a maze is created
+
+    def block_at(grid, point):
+        Returns the block at the point of a maze grid
+
+    def maze_size(width, height):
+        Returns the size in blocks of a maze with a size in tiles
 
-    def generate_piece_presets():
-        Generates and returns a list of maze piece presets
+    def barrier_position(width, height):
+        Returns the position of the left barrier block of a maze with a size in tiles
+
+    def cage_exit(width, height):
+        Returns the path block above the left barrier block of a maze with a size in tiles
+
+    def build_maze(rng=random, rejections=None, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
+        Generates and returns a pac-man maze that passes validation without needing a maze game component
+
+    def build_maze_candidate(rng=random, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
+        Generates and returns a pac-man maze which has not been validated
+
+    def generate_pieces(width, height, rng=random):
+        Generates and returns maze pieces that fit together
 
     Parent (GameComponent):
     """
     __doc__ += GameComponent.__doc__
+    preloaded_prefetcher = None
 
     def __init__(self, parent, bounds):
         super().__init__(parent, bounds)
-        self.maze = []
+        self.maze = MazeGrid(0, 0)
+        self.pickups = PickupIndex(self.maze)
         self.aspect_ratio = MAZE_WIDTH / MAZE_HEIGHT
+        self.opaque = True
         self.block_size = 0
         self.wall_surface = None
-        self.n = 0
-
-        globals.wall_images = {}
+        self.pickup_surface = None
+        self.corpus = None
+        self.prefetcher = None
+        self.level = 0
+        self.level_finished = False
+        self.next_maze = None
+        self.next_wall_surface = None
+        self.next_wall_row = 0
+
+        if not MAZE_CORPUS_FILE:
+            # Take the prefetcher that has been building the first level while the start menu showed
+            self.prefetcher = Maze.preloaded_prefetcher or MazePrefetcher(Maze.build_maze, MAZE_PREFETCH_COUNT)
+            Maze.preloaded_prefetcher = None
+            self.prefetcher.start()
+
+        # The wall tile atlases rotate, scale and mirror these for each block size
         for wall_type in BlockWallType:
-            for r in range(4):
-                globals.maze_wall_images[(wall_type, r * 90)] = pygame.transform.rotate(
-                    pygame.image.load(os.path.join(MAZE_FILE_PATH, BLOCK_WALL_IMAGES.get(wall_type))), r * 90)
+            globals.maze_wall_images[wall_type] = AssetRegistry.acquire_image(
+                os.path.join(MAZE_FILE_PATH, BLOCK_WALL_IMAGES.get(wall_type)))
 
-        globals.scaled_maze_wall_images = globals.maze_wall_images.copy()
+        globals.maze_barrier_image = AssetRegistry.acquire_image(os.path.join(MAZE_FILE_PATH, BLOCK_BARRIER_IMAGE))
 
-        globals.maze_barrier_image = pygame.image.load(os.path.join(MAZE_FILE_PATH, BLOCK_BARRIER_IMAGE))
-        globals.scaled_maze_barrier_image = globals.maze_barrier_image.copy()
-
-        globals.fruit_image = pygame.image.load(os.path.join(MAZE_FILE_PATH, FRUIT_IMAGE))
+        globals.fruit_image = AssetRegistry.acquire_image(os.path.join(MAZE_FILE_PATH, FRUIT_IMAGE))
         globals.scaled_fruit_image = globals.fruit_image.copy()
 
     def __iter__(self):
         """
-        Sets up object for iteration
-        """
-        self.n = 0
-        return self
-
-    def __next__(self):
-        """
-        Returns the next block in iteration
+        Returns an iterator over every block row by row
 
         Returns:
-            MazeBlock: The next block in iteration
-        """
-        # If the maze is defined and iterator counter is less than the number of blocks
-        if self.maze and self.n < len(self.maze) * len(self.maze[0]):
-            # Calculate x and y position based on the value of iterator
-            y = self.n // len(self.maze)
-            x = self.n % len(self.maze)
-            # Increment iterator
-            self.n += 1
-            # Return the block at point
-            return self.point((Point(x, y)))
-        else:
-            raise StopIteration
+            generator: The blocks in iteration
+        """
+        grid = self.maze
+        return (BLOCK_CLASSES[grid.block_types[index]](grid, index) for index in grid.indices())
 
     def __getitem__(self, x):
         """
@@ -98,42 +160,68 @@ class Maze(GameComponent):
         Returns:
             list: The column at x
         """
-        return self.maze[x]
+        return [self.point(Point(x, y)) for y in range(self.maze.height)]
 
     def start(self):
         globals.fruit_spawnable = False
-        self.generate_maze()
-        self.draw_walls()
+        # Keep the corpus open from the first level until the maze ends
+        if MAZE_CORPUS_FILE and self.corpus is None:
+            self.open_corpus()
+        if self.next_maze is None:
+            self.next_maze = self.next_level_maze()
+        self.maze = self.next_maze
+        self.pickups = PickupIndex(self.maze)
+
+        # Use the walls drawn while the last level finished if they were all drawn at the current size
+        if self.next_wall_surface is not None and self.next_wall_row == self.maze.height and \
+                self.next_wall_surface.get_size() == self.surface.get_size():
+            self.wall_surface = self.next_wall_surface
+        else:
+            self.draw_walls()
+        self.draw_pickups()
+
+        self.level_finished = False
+        self.next_maze = None
+        self.next_wall_surface = None
         super().start()
 
+    def end(self):
+        self.level = 0
+        self.level_finished = False
+        self.next_maze = None
+        self.next_wall_surface = None
+        if self.corpus is not None:
+            self.corpus.close()
+            self.corpus = None
+        super().end()
+
     def process_event(self, event):
         if event.type == GAME_START:
             globals.fruit_spawnable = False
             TimedEventManager.add_timed_event(pygame.event.Event(FRUIT_SPAWN_READY), FRUIT_COOLDOWN_DURATION)
-        elif event.type == LEVEL_FINISH or event.type == LEVEL_RESET:
+        elif event.type == LEVEL_FINISH:
+            globals.fruit_spawnable = False
+            self.level_finished = True
+        elif event.type == LEVEL_RESET:
             globals.fruit_spawnable = False
         elif event.type == FRUIT_SPAWN_READY:
             globals.fruit_spawnable = True
+            self.spawn_fruit()
         super().process_event(event)
 
+    def update(self):
+        if self.level_finished:
+            self.prerender_next_level()
+        super().update()
+
     def draw(self):
-        # Clear surface
-        self.surface.fill(EMPTY)
-        # Draw the walls
-        self.surface.blit(self.wall_surface, (0, 0))
-
-        # Draw path blocks and count the number of unconsumed points
-        globals.points_left = 0
-        for block in self:
-            if block.block_type == MazeBlockType.PATH:
-                block.draw(self.surface, self.block_size)
-                if not block.pickup_consumed:
-                    globals.points_left += 1
-                else:
-                    if globals.fruit_spawnable and random.randrange(1, 100 // FRUIT_SPAWN_CHANCE) == 1:
-                        block.pickup_type = BlockPickupType.FRUIT
-                        block.pickup_consumed = False
-                        globals.fruit_spawnable = False
+        if DISPLAY_MAZE_GRIDLINES:
+            self.mark_dirty()
+
+        # Draw the walls and the pickups left over the areas that changed, the opaque walls covering the old contents
+        for rect in self.dirty_rects:
+            self.surface.blit(self.wall_surface, rect, rect)
+            self.surface.blit(self.pickup_surface, rect, rect)
 
         if DISPLAY_MAZE_GRIDLINES:
             # Draw maze grid lines
@@ -157,19 +245,14 @@ class Maze(GameComponent):
         self.as_bounds.y += bound_position_offset
         self.as_bounds.width -= bound_position_offset * 2
         self.as_bounds.height -= bound_position_offset * 2
-        self.surface = pygame.Surface(self.as_bounds.size(), flags=pygame.SRCALPHA)
-
-        # Scale wall images using the raw original images
-        globals.scaled_maze_wall_images.clear()
-        block_size = (self.block_size, self.block_size)
-        for walL_type, image in globals.maze_wall_images.items():
-            globals.scaled_maze_wall_images[walL_type] = pygame.transform.smoothscale(image, block_size)
+        self.surface = create_surface(self.as_bounds.size(), not self.opaque)
 
-        globals.scaled_maze_barrier_image = pygame.transform.smoothscale(globals.maze_barrier_image, block_size)
-        globals.scaled_fruit_image = pygame.transform.smoothscale(globals.fruit_image, block_size)
+        globals.scaled_fruit_image = pygame.transform.smoothscale(globals.fruit_image,
+                                                                  (self.block_size, self.block_size))
 
-        # Draw the maze walls
+        # Draw the maze walls and pickups
         self.draw_walls()
+        self.draw_pickups()
 
     def point(self, point):
         """
@@ -181,35 +264,302 @@ class Maze(GameComponent):
         Returns:
             MazeBlock: The block at the point
         """
-        if 0 <= point.x < len(self.maze) and 0 <= point.y < len(self.maze[0]):
-            return self[point.x][point.y]
-        else:
-            return MazeBlock(point)
+        return Maze.block_at(self.maze, point)
+
+    def block_type(self, point):
+        """
+        Returns the type of the block at the point
+
+        Parameters:
+            point (Point): The location of the block
+
+        Returns:
+            MazeBlockType: The type of the block at the point
+        """
+        return self.maze.block_type(point.x, point.y)
 
     def draw_walls(self):
         """
         Draws the walls on the wall surface
         """
         # Setup wall drawing surface
-        self.wall_surface = pygame.surface.Surface(self.surface.get_size())
+        self.wall_surface = create_surface(self.surface.get_size(), False)
         # Draw the walls on the surface
-        for block in self:
-            if block.block_type != MazeBlockType.PATH:
-                block.draw(self.wall_surface, self.block_size)
+        self.draw_wall_rows(self.maze, self.wall_surface, 0, self.maze.height)
+        self.mark_dirty()
+
+    def draw_wall_rows(self, grid, surface, start_row, end_row):
+        """
+        Draws the walls of a range of rows of a maze grid on a surface
+
+        Parameters:
+            grid (MazeGrid): The maze grid
+            surface (Surface): The surface to draw on
+            start_row (int): The first row to draw
+            end_row (int): The row after the last row to draw
+        """
+        atlas = wall_tile_atlas(self.block_size)
+        block_size = self.block_size
+        tiles = []
+        for y in range(start_row, end_row):
+            row_start = grid.index(0, y)
+            for x in range(grid.width):
+                area = atlas.area(grid, row_start + x)
+                if area is not None:
+                    tiles.append((atlas.surface, (x * block_size, y * block_size), area))
+        surface.blits(tiles, False)
+
+    def draw_pickups(self):
+        """
+        Draws every pickup left on the pickup surface
+        """
+        self.pickup_surface = create_surface(self.surface.get_size())
+        grid = self.maze
+        path = MazeBlockType.PATH.value
+        for index in grid.indices():
+            if grid.block_types[index] == path and not grid.pickups_consumed[index]:
+                PathBlock(grid, index).draw_pickup(self.pickup_surface, self.block_size)
+        self.mark_dirty()
+
+    def redraw_pickup(self, block):
+        """
+        Redraws the tile of a path block on the pickup surface
+
+        Parameters:
+            block (PathBlock): The path block
+        """
+        position = block.position
+        rect = (position.x * self.block_size, position.y * self.block_size, self.block_size, self.block_size)
+        self.pickup_surface.fill(EMPTY, rect)
+        if not block.pickup_consumed:
+            block.draw_pickup(self.pickup_surface, self.block_size)
+        self.mark_dirty(rect)
+
+    def consume_pickup(self, point):
+        """
+        Consumes the pickup at the point and erases it from the pickup surface
+
+        Parameters:
+            point (Point): The location of the path block
+        """
+        index = self.maze.index(point.x, point.y)
+        if self.pickups.consume(index):
+            self.redraw_pickup(PathBlock(self.maze, index))
+            # Spawn a fruit that was ready before any pickup had been consumed
+            if globals.fruit_spawnable:
+                self.spawn_fruit()
+
+    def spawn_fruit(self):
+        """
+        Puts a fruit on a random block whose pickup has been consumed
+
+        The fruit stays ready to spawn until a pickup has been consumed if there are none to replace yet
+        """
+        index = self.pickups.spawn_fruit()
+        if index is not None:
+            globals.fruit_spawnable = False
+            self.redraw_pickup(PathBlock(self.maze, index))
+
+    def next_level_maze(self, block=True):
+        """
+        Returns the maze of the next level
+
+        Parameters:
+            block (bool): Whether to wait for the prefetcher if the maze is not built yet (Default: True)
 
-    def generate_maze(self):
+        Returns:
+            MazeGrid: The maze of the next level, or None if it is not built yet and block is False
+        """
+        if self.prefetcher is None:
+            grid = self.load_maze(self.level)
+        else:
+            grid = self.prefetcher.get(block)
+            if grid is None:
+                return None
+        self.level += 1
+        return grid
+
+    def prerender_next_level(self):
+        """
+        Takes the maze of the next level and draws a few more rows of its walls
+
+        Spreading the drawing across the frames of the level finish keeps the level start from stalling a frame
+        """
+        if self.next_maze is None:
+            self.next_maze = self.next_level_maze(False)
+            if self.next_maze is None:
+                return
+            self.next_wall_surface = None
+
+        # Start drawing again if the maze has been scaled since the drawing started
+        if self.next_wall_surface is None or self.next_wall_surface.get_size() != self.surface.get_size():
+            self.next_wall_surface = create_surface(self.surface.get_size(), False)
+            self.next_wall_row = 0
+
+        end_row = min(self.next_wall_row + MAZE_PRERENDER_ROWS, self.next_maze.height)
+        self.draw_wall_rows(self.next_maze, self.next_wall_surface, self.next_wall_row, end_row)
+        self.next_wall_row = end_row
+
+    def generate_maze(self, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
         """
         Generates and returns a pac-man maze
 
+        Parameters:
+            width (int): The width of the maze in tiles (Default: WIDTH_TILE_COUNT)
+            height (int): The height of the maze in tiles (Default: HEIGHT_TILE_COUNT)
+
         Returns:
-            list: A generated maze
+            MazeGrid: A generated maze
+        """
+        self.maze = Maze.build_maze(width=width, height=height)
+        self.pickups = PickupIndex(self.maze)
+        return self.maze
+
+    def open_corpus(self):
+        """
+        Opens the corpus the levels are loaded from
         """
-        # Create empty 2D list to store maze
-        self.maze = [[MazeBlock(Point(x, y)) for y in range(MAZE_HEIGHT)] for x in
-                     range(int((WIDTH_TILE_COUNT // 2 + 1) * TILE_SCALE_FACTOR + 1))]
+        corpus = MazeCorpus(MAZE_CORPUS_FILE)
+        if corpus.width != MAZE_WIDTH or corpus.height != MAZE_HEIGHT:
+            corpus.close()
+            raise ValueError(MAZE_CORPUS_FILE + " holds " + str(corpus.width) + "x" + str(corpus.height) +
+                             " mazes but the game needs " + str(MAZE_WIDTH) + "x" + str(MAZE_HEIGHT))
+        self.corpus = corpus
+
+    def load_maze(self, level):
+        """
+        Returns the maze of a level from the corpus
+
+        Parameters:
+            level (int): The level number, which wraps around to the start of the corpus
+
+        Returns:
+            MazeGrid: The loaded maze
+        """
+        return self.corpus.grid(level % len(self.corpus))
+
+    @staticmethod
+    def preload():
+        """
+        Loads the maze images and starts building the first level before a maze is created
+
+        This runs on the preload thread while the start menu is showing
+        """
+        for wall_type in BlockWallType:
+            AssetRegistry.preload_image(os.path.join(MAZE_FILE_PATH, BLOCK_WALL_IMAGES.get(wall_type)))
+        AssetRegistry.preload_image(os.path.join(MAZE_FILE_PATH, BLOCK_BARRIER_IMAGE))
+        AssetRegistry.preload_image(os.path.join(MAZE_FILE_PATH, FRUIT_IMAGE))
+
+        if not MAZE_CORPUS_FILE and Maze.preloaded_prefetcher is None:
+            Maze.preloaded_prefetcher = MazePrefetcher(Maze.build_maze, MAZE_PREFETCH_COUNT)
+            Maze.preloaded_prefetcher.start()
+
+    @staticmethod
+    def block_at(grid, point):
+        """
+        Returns the block at the point of a maze grid
+
+        Parameters:
+            grid (MazeGrid): The maze grid
+            point (Point): The location of the block to return
+
+        Returns:
+            MazeBlock: A view of the block at the point, or of an empty sentinel block if the point is out of bounds
+        """
+        index = grid.index(point.x, point.y)
+        return BLOCK_CLASSES[grid.block_types[index]](grid, index)
+
+    @staticmethod
+    def maze_size(width, height):
+        """
+        Returns the size in blocks of a maze with a size in tiles
+
+        Parameters:
+            width (int): The width of the maze in tiles
+            height (int): The height of the maze in tiles
+
+        Returns:
+            tuple: The width and height of the maze in blocks
+        """
+        # The left half of the tiles and the center column are mirrored, so even widths get an extra column of tiles
+        return (width // 2 + 1) * TILE_SCALE_FACTOR * 2, height * TILE_SCALE_FACTOR + 3
+
+    @staticmethod
+    def barrier_position(width, height):
+        """
+        Returns the position of the left barrier block of a maze with a size in tiles
+
+        The barrier sits on the top edge of the center piece, just left of the mirror line
+
+        Parameters:
+            width (int): The width of the maze in tiles
+            height (int): The height of the maze in tiles
+
+        Returns:
+            Point: The position of the left barrier block
+        """
+        return Point((width // 2 + 1) * TILE_SCALE_FACTOR - 1, (height // 2 - 1) * TILE_SCALE_FACTOR + 2)
+
+    @staticmethod
+    def cage_exit(width, height):
+        """
+        Returns the path block above the left barrier block of a maze with a size in tiles
+
+        Parameters:
+            width (int): The width of the maze in tiles
+            height (int): The height of the maze in tiles
+
+        Returns:
+            Point: The position of the cage exit
+        """
+        barrier = Maze.barrier_position(width, height)
+        return Point(barrier.x, barrier.y - 1)
+
+    @staticmethod
+    def build_maze(rng=random, rejections=None, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
+        """
+        Generates and returns a pac-man maze that passes validation without needing a maze game component
+
+        Mazes that fail validation are thrown away and generated again from where the random number generator left off
+
+        Parameters:
+            rng (Random): The random number generator to draw from (Default: the random module)
+            rejections (list): The list to add the report of every rejected maze to (Default: None)
+            width (int): The width of the maze in tiles (Default: WIDTH_TILE_COUNT)
+            height (int): The height of the maze in tiles (Default: HEIGHT_TILE_COUNT)
+
+        Returns:
+            MazeGrid: The grid of blocks making up the maze
+        """
+        cage_exit = Maze.cage_exit(width, height)
+        for attempt in range(MAZE_MAX_ATTEMPTS):
+            grid = Maze.build_maze_candidate(rng, width, height)
+            report = validate_maze(grid, cage_exit)
+            if report.is_valid():
+                return grid
+            if rejections is not None:
+                rejections.append(report)
+
+        raise RuntimeError("no generated maze passed validation in " + str(MAZE_MAX_ATTEMPTS) + " attempts")
+
+    @staticmethod
+    def build_maze_candidate(rng=random, width=WIDTH_TILE_COUNT, height=HEIGHT_TILE_COUNT):
+        """
+        Generates and returns a pac-man maze which has not been validated
+
+        Parameters:
+            rng (Random): The random number generator to draw from (Default: the random module)
+            width (int): The width of the maze in tiles (Default: WIDTH_TILE_COUNT)
+            height (int): The height of the maze in tiles (Default: HEIGHT_TILE_COUNT)
+
+        Returns:
+            MazeGrid: The grid of blocks making up the maze
+        """
+        # Create empty grid to store the left half of the maze
+        half_grid = MazeGrid((width // 2 + 1) * TILE_SCALE_FACTOR + 1, Maze.maze_size(width, height)[1])
 
         # Get the maze pieces
-        pieces = Maze.generate_pieces(WIDTH_TILE_COUNT // 2 + 1, HEIGHT_TILE_COUNT)
+        pieces = Maze.generate_pieces(width // 2 + 1, height, rng)
 
         # Set the first edge piece in the pieces list to an empty edge piece
         for piece in pieces:
@@ -219,167 +569,89 @@ class Maze(GameComponent):
 
         # Insert each piece into maze
         for piece in pieces:
-            piece.fill_maze(self.maze)
+            piece.fill_maze(half_grid)
 
-        # Remove last column to make it symmetrical for mirroring
-        self.maze.pop()
+        # Leave out the last column to make it symmetrical for mirroring
+        half_width = half_grid.width - 1
 
         # Set barrier block
-        self.maze[-1][MAZE_BARRIER_Y_POSITION] = BarrierBlock(Point(len(self.maze) - 1, MAZE_BARRIER_Y_POSITION))
+        barrier = Maze.barrier_position(width, height)
+        half_grid.set_block_type(barrier.x, barrier.y, MazeBlockType.BARRIER)
 
         # Add power pellets
-        # Find all path blocks to the left of the power pellet max x setting
-        path_blocks = [block for block in self if block.block_type == MazeBlockType.PATH and
-                       block.position.x <= POWER_PELLET_MAX_X]
+        # Find all path blocks to the left of the power pellet max x setting, scaled to the maze width
+        power_pellet_max_x = POWER_PELLET_MAX_X * width // WIDTH_TILE_COUNT
+        path = MazeBlockType.PATH.value
+        path_indices = [index for y in range(half_grid.height) for index in
+                        range(half_grid.index(0, y), half_grid.index(min(half_width - 1, power_pellet_max_x), y) + 1)
+                        if half_grid.block_types[index] == path]
         # For the number of power pellets, choose random path blocks set their pickup type to power pellet
         for i in range(POWER_PELLET_QUANTITY // 2):
-            random_block = random.choice(path_blocks)
-            random_block.pickup_type = BlockPickupType.POWER_PELLET
-            path_blocks.remove(random_block)
+            random_index = rng.choice(path_indices)
+            half_grid.pickup_types[random_index] = BlockPickupType.POWER_PELLET.value
+            path_indices.remove(random_index)
 
         # Mirror the maze
-        for x in range(len(self.maze) - 1, -1, -1):
-            self.maze.append([])
-            for y in range(len(self.maze[0])):
-                new_block = self.maze[x][y].copy()
-                new_block.position = Point(len(self.maze) - 1, y)
-                self.maze[-1].append(new_block)
-
-        # Setup wall blocks and add point path blocks
-        for block in self:
-            if block.block_type == MazeBlockType.WALL:
-                block.setup(self)
-            elif block.block_type == MazeBlockType.PATH:
-                if block.pickup_type == BlockPickupType.NONE:
-                    block.pickup_type = BlockPickupType.POINT
-                    globals.points_left += 1
+        grid = half_grid.mirrored(half_width)
+
+        # Setup wall blocks
+        WallBlock.autotile(grid)
+
+        # Add point path blocks
+        no_pickup = BlockPickupType.NONE.value
+        point_pickup = BlockPickupType.POINT.value
+        for index in grid.indices():
+            if grid.block_types[index] == path and grid.pickup_types[index] == no_pickup:
+                grid.pickup_types[index] = point_pickup
+
+        return grid
 
     @staticmethod
-    def generate_pieces(width, height):
+    def generate_pieces(width, height, rng=random):
         """
         Generates and returns maze pieces that fit together
 
         Parameters:
             width (int): The width of the maze in tiles
             height (int): The height of the maze in tiles
+            rng (Random): The random number generator to draw from (Default: the random module)
 
         Returns:
             list: The list of maze pieces
         """
 
-        # Create a list of points for each tile
-        unoccupied_tiles = [Point(x, y) for x in range(width) for y in range(height)]
         # Empty list to hold the maze pieces
         maze_pieces = []
 
-        center_piece = MazePiece([Point(3, 3), Point(3, 4), Point(4, 3), Point(4, 4)])
-        for point in center_piece.center_points:
-            unoccupied_tiles.remove(point)
-
-        # Generate a list of all possible piece presets
-        piece_presets = Maze.generate_piece_presets()
-
         # Shuffle the presets and put the default 1 square preset shape at the end to reduce frequency
-        default_preset = piece_presets[0]
-        piece_presets.remove(default_preset)
-        random.shuffle(piece_presets)
-        piece_presets.append(default_preset)
-
-        # While there are still unoccupied_tiles
-        while unoccupied_tiles:
-
-            # Choose a random tile
-            current_tile_point = random.choice(unoccupied_tiles)
-            # For every preset
-            for preset in piece_presets:
-                fits = True
-                # Try putting the preset on the current tile with every single tile in the preset
-                for center_point in preset.center_points:
-                    # Calculate displacement from selected point to current tile point
-                    displacement = current_tile_point - center_point
-                    # Deep copy the preset so it doesn't get modified when we translate it
-                    copied_preset = deepcopy(preset)
-                    # Translate the preset to the start point
-                    copied_preset.translate(displacement)
-
-                    fits = True
-                    # For each point in the center points
-                    for point in copied_preset.center_points:
-                        # If the point is out of bounds or is not occupied
-                        if point.x > width - 1 or point.x < 0 or point.y > height - 1 or point.y < 0 or point not in unoccupied_tiles:
-                            # Set fits to false and break
-                            fits = False
-                            break
-
-                    # If the preset fits
-                    if fits:
-                        # Add the preset to list of pieces and remove the occupied tiles from unoccupied list
-                        for point in copied_preset.center_points:
-                            if point in unoccupied_tiles:
-                                unoccupied_tiles.remove(point)
-                        maze_pieces.append(copied_preset)
-                        break
-
-                # If the preset fits, choose another random tile
-                if fits:
-                    break
+        preset_order = list(range(1, len(PIECE_PRESETS)))
+        rng.shuffle(preset_order)
+        preset_order.append(0)
+
+        # Create a tiler to track the occupied tiles and test the presets in order
+        placements = preset_placements(height)
+        tiler = MazeTiler(width, height, [placements[preset] for preset in preset_order])
+
+        # The center piece sits on the last column, which is mirrored onto the other half
+        center_x = width - 1
+        center_y = height // 2
+        center_piece = MazePiece([Point(center_x - 1, center_y - 1), Point(center_x - 1, center_y),
+                                  Point(center_x, center_y - 1), Point(center_x, center_y)])
+        tiler.occupy(center_piece.center_points)
+
+        # While there are still unoccupied tiles
+        while tiler.free_count:
+            # Choose a random tile and place the first preset that fits on it
+            placement = tiler.place(tiler.random_free_tile(rng))
+            # If a preset fits, add a translated copy of it to the list of pieces
+            if placement:
+                preset_index, displacement = placement
+                maze_pieces.append(MazePiece([Point(x + displacement.x, y + displacement.y) for x, y in
+                                              PIECE_PRESETS[preset_order[preset_index]]]))
 
         # Return the generated pieces
         return maze_pieces
 
-    @staticmethod
-    def generate_piece_presets():
-        """
-        Generates and returns a list of maze piece presets
-
-        Returns:
-            list: The list of maze piece presets
-        """
-        # Direction to vector translate dictionary
-        direction_vector_map = {"L": Vector(-1, 0), "R": Vector(1, 0), "U": Vector(0, 1), "D": Vector(0, -1)}
-
-        # Empty list to store the resulting presets
-        piece_presets = []
-
-        piece_presets_path = os.path.join(SAVE_FILE_PATH, PIECE_PRESETS_FILE)
-
-        if os.path.exists(piece_presets_path):
-            file = open(piece_presets_path, "rb")
-            piece_presets = pickle.load(file)
-        else:
-            # For all the point paths in the shape presets
-            for paths in maze_piece_shape_presets:
-                points = {Point(0, 0)}  # List stores all the points for this piece shape preset
-                # For every path in the paths
-                for path in paths:
-                    # Start at origin
-                    point = Point(0, 0)
-                    # For each direction in the path
-                    for direction in path:
-                        # Add on the vector representation of the direction to the current point
-                        point += direction_vector_map.get(direction)
-                    # Add the point to the list of points for this piece shape preset
-                    points.add(point)
-
-                # Cycle through each rotation and generate all possible pieces for the shape preset
-                # i represents the number of 90 degree rotations applied
-                for i in range(4):
-                    # Create a MazePiece object with the points
-                    # Use deepcopy so that the pieces don't modify each others' points
-                    piece_preset = MazePiece(deepcopy(list(points)))
-                    # Rotate it around the current point with the current angle
-                    piece_preset.rotate(i * 90, Point(0, 0))
-                    # Add it to the list of piece presets if its not already in the list
-                    if piece_preset not in piece_presets:
-                        piece_presets.append(piece_preset)
-
-            file = open(piece_presets_path, "wb")
-            pickle.dump(piece_presets, file)
-            file.close()
-
-        # Return all the piece presets
-        return piece_presets
-
 
 class MazePiece:
     """
@@ -491,115 +763,79 @@ class MazePiece:
     def calculate_vertices(self):
         """
         Calculates the edge vertex points of the piece in order
+
+        The outline is traced clockwise from the left most lowest vertex, with a vertex at every tile corner on the edge
+        of the piece
         """
-        # Get the unsorted vertices by taking the scaling the tiles with the tile scale factor and getting the corner
-        # blocks of the scaled tiles
-        unsorted_vertices = []
+        # Scale the tiles with the tile scale factor and collect the tile coordinates
+        tiles = set()
         for point in self.center_points:
-            scaled_center_point = point * TILE_SCALE_FACTOR + Point(TILE_SCALE_FACTOR // 2, TILE_SCALE_FACTOR // 2)
-            half_tile = TILE_SCALE_FACTOR // 2
-            self.scaled_center_points.append(scaled_center_point)
-            unsorted_vertices.append(scaled_center_point + Point(half_tile + 1, half_tile + 1))
-            unsorted_vertices.append(scaled_center_point + Point(half_tile + 1, -half_tile))
-            unsorted_vertices.append(scaled_center_point + Point(-half_tile, half_tile + 1))
-            unsorted_vertices.append(scaled_center_point + Point(-half_tile, -half_tile))
-
-        # Get rid of overlapping vertices and vertices which lie in the middle of the piece
-        # For each vertex
-        for vertex in unsorted_vertices.copy():
-            # Get the number of identical vertices
-            frequency = unsorted_vertices.count(vertex)
-            # If there are 4 identical vertices, then the vertex lies in the center of the piece
-            if frequency == 4:
-                # Remove all 4 vertices
-                num_to_remove = 4
-            # Otherwise
-            else:
-                # Remove all but one
-                num_to_remove = frequency - 1
-            # Remove the vertices
-            for i in range(num_to_remove):
-                unsorted_vertices.remove(vertex)
-
-        # Start at the left most vertex
-        current_vertex = Point.left_most(unsorted_vertices)
-        # Remove it from unsorted vertices list and add it to the vertices
-        unsorted_vertices.remove(current_vertex)
-        self.vertices = [current_vertex]
-
-        # While not all vertices have been ordered
-        while unsorted_vertices:
-            # Holds the best candidate vertex along with the angle it makes with the current vertex
-            next_vertex = [Point(1000, 1000), -1000]
-            # For each vertex in the unsorted list
-            for vertex in unsorted_vertices:
-                # If the vertices are lined up directly on the grid
-                if current_vertex.is_grid_collinear(vertex):
-                    # If the vector from current vertex to the vertex doesn't intersect any of the ordered vertices
-                    if len(self.vertices) < 2 or not (vertex - current_vertex).vector().intersects_points(
-                            self.vertices[:-1], current_vertex):
-                        # Get the angle from the vertex and the current vertex
-                        angle = (vertex - current_vertex).vector().angular_position()
-                        # If the angle is bigger than the best vertex so far, set the best vertex to this vertex
-                        if angle > next_vertex[1]:
-                            next_vertex = [vertex, angle]
-                        # If the angle is the same as best vertex so far, only set the best vertex to this vertex if
-                        # its closer to the current vertex
-                        elif angle == next_vertex[1]:
-                            if Point.distance(current_vertex, vertex) < Point.distance(current_vertex, next_vertex[0]):
-                                next_vertex = [vertex, angle]
-
-            # Set the current vertex to the new vertex
-            current_vertex = next_vertex[0]
-            # Remove the new vertex from unsorted list and add it to the vertices list
-            unsorted_vertices.remove(next_vertex[0])
-            self.vertices.append(next_vertex[0])
+            self.scaled_center_points.append(point * TILE_SCALE_FACTOR +
+                                             Point(TILE_SCALE_FACTOR // 2, TILE_SCALE_FACTOR // 2))
+            tiles.add((point.x, point.y))
+
+        # Scale the outline corners up to the block corners
+        self.vertices = [Point(x * TILE_SCALE_FACTOR, y * TILE_SCALE_FACTOR) for x, y in piece_outline(tiles)]
 
     def fill_maze(self, maze):
         """
         Fills maze with blocks
 
         Parameters:
-            maze (list): The maze to fill
+            maze (MazeGrid): The maze grid to fill
         """
         # Calculate the vertices
         self.calculate_vertices()
 
+        block_types = maze.block_types
+        stride = maze.stride
+        path = MazeBlockType.PATH.value
+        wall = MazeBlockType.WALL.value
+        empty = MazeBlockType.EMPTY.value
+        half_scale = TILE_SCALE_FACTOR // 2
+
         # If the piece isn't a empty edge piece type, start by filling all the piece tile blocks with walls
         if not self.empty_edge_piece:
-            # For each block around each scaled center point
+            # For each row of blocks of each scaled center point
+            wall_row = bytes([wall]) * TILE_SCALE_FACTOR
             for center_point in self.scaled_center_points:
-                for x in range(TILE_SCALE_FACTOR):
-                    for y in range(TILE_SCALE_FACTOR):
-                        point = center_point + Point(x, y)
-                        # Set the block to wall
-                        maze[point.x][point.y] = WallBlock(point)
+                index = maze.index(center_point.x, center_point.y)
+                for y in range(TILE_SCALE_FACTOR):
+                    # Set the blocks to wall
+                    block_types[index:index + TILE_SCALE_FACTOR] = wall_row
+                    index += stride
+
+        # The array offsets of the surrounding blocks
+        neighbour_offsets = [(dx, dy, dy * stride + dx) for direction, dx, dy in NEIGHBOUR_OFFSETS]
 
         # Set the current point the first vertex in the vertices list
-        current_point = self.vertices[0]
+        current_x = self.vertices[0].x
+        current_y = self.vertices[0].y
         # Cycle through vertices starting from the second vertices
-        for point in self.vertices[1:] + [current_point]:
+        for point in self.vertices[1:] + [self.vertices[0]]:
             # Get the direction going from the current point to current vertex
-            direction = (point - current_point).vector().normalised()
+            dx = (point.x > current_x) - (point.x < current_x)
+            dy = (point.y > current_y) - (point.y < current_y)
             # While we still haven't arrived at the current vertex
-            while current_point != point:
+            while current_x != point.x or current_y != point.y:
                 # Move the point down and right by half the scale factor to make room for the outer walls
-                x = int(current_point.x) + TILE_SCALE_FACTOR // 2
-                y = int(current_point.y) + TILE_SCALE_FACTOR // 2
+                x = current_x + half_scale
+                y = current_y + half_scale
                 # If the x value is within the map width
-                if x < len(maze):
+                if x < maze.width:
                     # If not an empty edge piece, set current point to path otherwise, only make it a path if the point
                     # doesn't lie on the edge of the maze
-                    if not self.empty_edge_piece or (x > TILE_SCALE_FACTOR // 2 and TILE_SCALE_FACTOR // 2 < y < len(
-                            maze[0]) - TILE_SCALE_FACTOR // 2 - 1):
-                        maze[x][y] = PathBlock(Point(x, y))
+                    if not self.empty_edge_piece or (x > half_scale and half_scale < y < maze.height - half_scale - 1):
+                        index = maze.index(x, y)
+                        block_types[index] = path
                         # Set all the empty blocks around this current path block to walls
-                        for block in Point.get_neighbour_points(Point(x, y)):
-                            if 0 <= block.x < len(maze) and 0 <= block.y < len(maze[0]):
-                                if maze[block.x][block.y] == MazeBlockType.EMPTY:
-                                    maze[block.x][block.y] = WallBlock(block)
+                        for neighbour_dx, neighbour_dy, offset in neighbour_offsets:
+                            if 0 <= x + neighbour_dx < maze.width and 0 <= y + neighbour_dy < maze.height:
+                                if block_types[index + offset] == empty:
+                                    block_types[index + offset] = wall
                 # Move to the next point by going towards the vertex by one block
-                current_point += direction
+                current_x += dx
+                current_y += dy
 
     def is_edge_piece(self, edge_density):
         """
@@ -627,10 +863,14 @@ class MazeBlock:
     """
     A maze block is a the simplest form of object that makes up a maze
 
+    Blocks are light views of a cell of a maze grid, so reading or changing their attributes reads or changes the grid
+
     ...
 
     Attributes:
     -----------
+    grid (MazeGrid): The maze grid the block is in
+    index (int): The array index of the block in the maze grid
     position (Point): The position of the block
 
 
@@ -642,24 +882,24 @@ class MazeBlock:
     --------
     def draw(self, surface, block_size):
         Draws the block on the surface
-
-    def copy(self):
-        Returns a copy object
     """
+    __slots__ = ("grid", "index")
 
     block_type = MazeBlockType.EMPTY
 
-    def __init__(self, position):
+    def __init__(self, grid, index):
         """
-        Returns a new maze block object
+        Returns a new maze block view
 
         Parameters:
-            position (Point): The location of the block
+            grid (MazeGrid): The maze grid the block is in
+            index (int): The array index of the block in the maze grid
 
         Returns:
-            MazeBlock: A new maze block object
+            MazeBlock: A new maze block view
         """
-        self.position = position
+        self.grid = grid
+        self.index = index
 
     def __str__(self):
         """
@@ -691,6 +931,16 @@ class MazeBlock:
         """
         return self.block_type == other
 
+    @property
+    def position(self):
+        """
+        Returns the position of the block
+
+        Returns:
+            Point: The position of the block
+        """
+        return Point(*self.grid.position(self.index))
+
     def draw(self, surface, block_size):
         """
         Draws the block on the surface
@@ -704,15 +954,6 @@ class MazeBlock:
                          (self.position.x * block_size, self.position.y * block_size,
                           block_size, block_size))
 
-    def copy(self):
-        """
-        Returns a copy object
-
-        Returns:
-            MazeBlock: A copy object
-        """
-        return self.__class__(self.position)
-
 
 class PathBlock(MazeBlock):
     """
@@ -723,47 +964,69 @@ class PathBlock(MazeBlock):
     pickup_type (BlockPickupType): The type of pickup available at this path block
     pickup_consumed (bool): Whether the pickup has been consumed
 
+    Methods:
+    --------
+    def draw_pickup(self, surface, block_size):
+        Draws the pickup of the block on the surface if it has not been consumed
+
     Parent (MazeBlock):
     """
     __doc__ += MazeBlock.__doc__
 
+    __slots__ = ()
+
     block_type = MazeBlockType.PATH
 
-    def __init__(self, position):
-        super().__init__(position)
-        self.pickup_type = BlockPickupType.NONE
-        self.pickup_consumed = False
+    @property
+    def pickup_type(self):
+        return PICKUP_TYPES[self.grid.pickup_types[self.index]]
+
+    @pickup_type.setter
+    def pickup_type(self, pickup_type):
+        self.grid.pickup_types[self.index] = pickup_type.value
+
+    @property
+    def pickup_consumed(self):
+        return bool(self.grid.pickups_consumed[self.index])
+
+    @pickup_consumed.setter
+    def pickup_consumed(self, consumed):
+        self.grid.pickups_consumed[self.index] = consumed
 
     def draw(self, surface, block_size):
         # Draw black square on block as background
         pygame.draw.rect(surface, MAZE_PATH_COLOR,
                          (self.position.x * block_size, self.position.y * block_size,
                           block_size, block_size))
+        self.draw_pickup(surface, block_size)
 
+    def draw_pickup(self, surface, block_size):
+        """
+        Draws the pickup of the block on the surface if it has not been consumed
+
+        Parameters:
+            surface (Surface): The surface to draw on
+            block_size (int): The size of each block in pixels
+        """
         # If the pickup has still not been consumed, draw it
         if not self.pickup_consumed:
+            position = self.position
             # If its a point pickup, draw a circle the size of a point pickup
             if self.pickup_type == BlockPickupType.POINT:
                 pygame.draw.circle(surface, MAZE_POINT_COLOR,
-                                   ((self.position.x + 0.5) * block_size,
-                                    (self.position.y + 0.5) * block_size),
+                                   ((position.x + 0.5) * block_size,
+                                    (position.y + 0.5) * block_size),
                                    MAZE_POINT_RADIUS_FACTOR * block_size // 2)
 
             # If its a power pellet pickup, draw a circle the size of a power pellet
             elif self.pickup_type == BlockPickupType.POWER_PELLET:
                 pygame.draw.circle(surface, MAZE_POINT_COLOR,
-                                   ((self.position.x + 0.5) * block_size,
-                                    (self.position.y + 0.5) * block_size),
+                                   ((position.x + 0.5) * block_size,
+                                    (position.y + 0.5) * block_size),
                                    MAZE_POWER_PELLET_RADIUS_FACTOR * block_size // 2)
 
             elif self.pickup_type == BlockPickupType.FRUIT:
-                surface.blit(globals.scaled_fruit_image, (self.position.x * block_size, self.position.y * block_size))
-
-    def copy(self):
-        new_block = super().copy()
-        new_block.pickup_type = self.pickup_type
-        new_block.pickup_consumed = self.pickup_consumed
-        return new_block
+                surface.blit(globals.scaled_fruit_image, (position.x * block_size, position.y * block_size))
 
 
 class WallBlock(MazeBlock):
@@ -782,30 +1045,140 @@ class WallBlock(MazeBlock):
     def setup(self, maze):
         Sets up the wall type, orientation and mirror settings for drawing the wall
 
+    Static Methods:
+    ---------------
+    def autotile(grid):
+        Sets up the wall type, orientation and mirror settings of every wall in a maze grid at once
+
+    def table_wall_settings(key):
+        Calculates, stores and returns the table entry for a combination of neighbour bitmasks
+
+    def wall_settings(neighbours):
+        Returns the wall type, orientation and mirror settings of a wall from the types of its neighbours
+
     Parent (MazeBlock):
     """
+    __slots__ = ()
+
     block_type = MazeBlockType.WALL
 
-    def __init__(self, position):
-        super().__init__(position)
-        self.wall_type = BlockWallType.CENTER
-        self.orientation = 0
-        self.mirror_x = False
-        self.mirror_y = False
+    @property
+    def wall_type(self):
+        return WALL_TYPES[self.grid.wall_types[self.index]]
+
+    @wall_type.setter
+    def wall_type(self, wall_type):
+        self.grid.wall_types[self.index] = wall_type.value
+
+    @property
+    def orientation(self):
+        return self.grid.wall_orientations[self.index] * 90
+
+    @orientation.setter
+    def orientation(self, orientation):
+        self.grid.wall_orientations[self.index] = orientation // 90 % 4
+
+    @property
+    def mirror_x(self):
+        return bool(self.grid.wall_mirrors[self.index] & MIRROR_X)
+
+    @mirror_x.setter
+    def mirror_x(self, mirror):
+        if mirror:
+            self.grid.wall_mirrors[self.index] |= MIRROR_X
+        else:
+            self.grid.wall_mirrors[self.index] &= ~MIRROR_X
+
+    @property
+    def mirror_y(self):
+        return bool(self.grid.wall_mirrors[self.index] & MIRROR_Y)
+
+    @mirror_y.setter
+    def mirror_y(self, mirror):
+        if mirror:
+            self.grid.wall_mirrors[self.index] |= MIRROR_Y
+        else:
+            self.grid.wall_mirrors[self.index] &= ~MIRROR_Y
 
     def setup(self, maze):
         """
         Sets up the wall type, orientation and mirror settings for drawing the wall
 
         Parameters:
-            maze (Maze): The maze object to get information from
+            maze (MazeGrid): The maze grid to get information from
         """
+        x, y = maze.position(self.index)
+        neighbours = {direction: maze.block_type(x + dx, y + dy) for direction, dx, dy in NEIGHBOUR_OFFSETS}
+        self.wall_type, self.orientation, self.mirror_x, self.mirror_y = WallBlock.wall_settings(neighbours)
 
-        # Get neighbours
-        neighbours = {"TL": maze.point(self.position + Point(-1, -1)), "L": maze.point(self.position + Point(-1, 0)),
-                      "BL": maze.point(self.position + Point(-1, 1)), "B": maze.point(self.position + Point(0, 1)),
-                      "BR": maze.point(self.position + Point(1, 1)), "R": maze.point(self.position + Point(1, 0)),
-                      "TR": maze.point(self.position + Point(1, -1)), "T": maze.point(self.position + Point(0, -1))}
+    @staticmethod
+    def autotile(grid):
+        """
+        Sets up the wall type, orientation and mirror settings of every wall in a maze grid at once
+
+        The empty, wall and barrier neighbours of every cell are gathered into bitmasks for the whole grid with array
+        shifts, and the settings for each combination of masks are looked up in a table which is filled on first use
+
+        Parameters:
+            grid (MazeGrid): The maze grid to set up
+        """
+        empty_masks = grid.neighbour_masks(MazeBlockType.EMPTY)
+        wall_masks = grid.neighbour_masks(MazeBlockType.WALL)
+        barrier_masks = grid.neighbour_masks(MazeBlockType.BARRIER)
+
+        wall_value = MazeBlockType.WALL.value
+        block_types = grid.block_types
+        for index in grid.indices():
+            if block_types[index] == wall_value:
+                key = empty_masks[index] | wall_masks[index] << 8 | barrier_masks[index] << 16
+                settings = WALL_SETTINGS_TABLE.get(key)
+                if settings is None:
+                    settings = WallBlock.table_wall_settings(key)
+                grid.wall_types[index], grid.wall_orientations[index], grid.wall_mirrors[index] = settings
+
+    @staticmethod
+    def table_wall_settings(key):
+        """
+        Calculates, stores and returns the table entry for a combination of neighbour bitmasks
+
+        Parameters:
+            key (int): The empty, wall and barrier neighbour bitmasks packed into the first, second and third byte
+
+        Returns:
+            tuple: The wall type value, number of 90 degree rotations and mirror flags
+        """
+        # Neighbours that aren't empty, a wall or a barrier are paths
+        neighbours = {}
+        for bit, (direction, dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+            if key & 1 << bit:
+                neighbours[direction] = MazeBlockType.EMPTY
+            elif key & 1 << (bit + 8):
+                neighbours[direction] = MazeBlockType.WALL
+            elif key & 1 << (bit + 16):
+                neighbours[direction] = MazeBlockType.BARRIER
+            else:
+                neighbours[direction] = MazeBlockType.PATH
+
+        wall_type, orientation, mirror_x, mirror_y = WallBlock.wall_settings(neighbours)
+        settings = (wall_type.value, orientation // 90, (MIRROR_X if mirror_x else 0) | (MIRROR_Y if mirror_y else 0))
+        WALL_SETTINGS_TABLE[key] = settings
+        return settings
+
+    @staticmethod
+    def wall_settings(neighbours):
+        """
+        Returns the wall type, orientation and mirror settings of a wall from the types of its neighbours
+
+        Parameters:
+            neighbours (dict): The block type of each neighbour keyed by its direction
+
+        Returns:
+            tuple: The wall type, orientation, mirror x and mirror y settings
+        """
+        wall_type = BlockWallType.CENTER
+        orientation = 0
+        mirror_x = False
+        mirror_y = False
 
         side_neighbours = {"L": neighbours.get("L"),
                            "B": neighbours.get("B"),
@@ -814,10 +1187,10 @@ class WallBlock(MazeBlock):
 
         # If beside barrier
         if neighbours.get("R") == MazeBlockType.BARRIER or neighbours.get("L") == MazeBlockType.BARRIER:
-            self.wall_type = BlockWallType.EDGE_BARRIER_SIDE
+            wall_type = BlockWallType.EDGE_BARRIER_SIDE
             if neighbours.get("R") == MazeBlockType.BARRIER:
-                self.mirror_x = True
-            return
+                mirror_x = True
+            return wall_type, orientation, mirror_x, mirror_y
 
         # Get block count of surrounding blocks
         wall_count = list(neighbours.values()).count(MazeBlockType.WALL)
@@ -832,62 +1205,58 @@ class WallBlock(MazeBlock):
         # Depending on the surrounding block type, determine the orientation, type and mirror settings
         if block_count == 2 or block_count == 3:
             if outer_edge and list(side_neighbours.values()).count(MazeBlockType.WALL) == 3:
-                self.wall_type = BlockWallType.EDGE_CONNECTOR_SIDE
+                wall_type = BlockWallType.EDGE_CONNECTOR_SIDE
                 if neighbours.get("L") == indicating_block_type:
-                    self.orientation = 90
-                    self.mirror_y = neighbours.get("BR") == MazeBlockType.PATH
+                    orientation = 90
+                    mirror_y = neighbours.get("BR") == MazeBlockType.PATH
                 elif neighbours.get("R") == indicating_block_type:
-                    self.orientation = 270
-                    self.mirror_y = neighbours.get("TL") == MazeBlockType.PATH
+                    orientation = 270
+                    mirror_y = neighbours.get("TL") == MazeBlockType.PATH
             else:
-                self.wall_type = BlockWallType.EDGE_SIDE if outer_edge else BlockWallType.SIDE
+                wall_type = BlockWallType.EDGE_SIDE if outer_edge else BlockWallType.SIDE
                 if neighbours.get("L") == indicating_block_type:
-                    self.orientation = 90
+                    orientation = 90
                 elif neighbours.get("R") == indicating_block_type:
-                    self.orientation = 270
+                    orientation = 270
                 elif neighbours.get("T") == indicating_block_type:
-                    self.orientation = 0
+                    orientation = 0
                 elif neighbours.get("B") == indicating_block_type:
-                    self.orientation = 180
+                    orientation = 180
 
         elif block_count == 1:
             if wall_count == 4 and outer_edge:
-                self.wall_type = BlockWallType.EDGE_CONNECTOR_CORNER
+                wall_type = BlockWallType.EDGE_CONNECTOR_CORNER
             else:
-                self.wall_type = BlockWallType.EDGE_INNER_CORNER if outer_edge else BlockWallType.CORNER
+                wall_type = BlockWallType.EDGE_INNER_CORNER if outer_edge else BlockWallType.CORNER
 
             if neighbours.get("TL") == indicating_block_type:
-                self.orientation = 180
+                orientation = 180
             elif neighbours.get("BL") == indicating_block_type:
-                self.orientation = 0 if self.wall_type == BlockWallType.EDGE_CONNECTOR_CORNER else 270
-                self.mirror_x = self.wall_type == BlockWallType.EDGE_CONNECTOR_CORNER
+                orientation = 0 if wall_type == BlockWallType.EDGE_CONNECTOR_CORNER else 270
+                mirror_x = wall_type == BlockWallType.EDGE_CONNECTOR_CORNER
             elif neighbours.get("BR") == indicating_block_type:
-                self.orientation = 0
+                orientation = 0
             elif neighbours.get("TR") == indicating_block_type:
-                self.orientation = 180 if self.wall_type == BlockWallType.EDGE_CONNECTOR_CORNER else 90
-                self.mirror_x = self.wall_type == BlockWallType.EDGE_CONNECTOR_CORNER
+                orientation = 180 if wall_type == BlockWallType.EDGE_CONNECTOR_CORNER else 90
+                mirror_x = wall_type == BlockWallType.EDGE_CONNECTOR_CORNER
 
         elif block_count == 4 or block_count == 5 or block_count == 6:
-            self.wall_type = BlockWallType.EDGE_OUTER_CORNER if outer_edge else BlockWallType.CORNER
+            wall_type = BlockWallType.EDGE_OUTER_CORNER if outer_edge else BlockWallType.CORNER
             if neighbours.get("L") == indicating_block_type and neighbours.get("T") == indicating_block_type:
-                self.orientation = 0
+                orientation = 0
             elif neighbours.get("L") == indicating_block_type and neighbours.get("B") == indicating_block_type:
-                self.orientation = 90
+                orientation = 90
             elif neighbours.get("R") == indicating_block_type and neighbours.get("B") == indicating_block_type:
-                self.orientation = 180
+                orientation = 180
             elif neighbours.get("R") == indicating_block_type and neighbours.get("T") == indicating_block_type:
-                self.orientation = 270
+                orientation = 270
 
-    def draw(self, surface, block_size):
-        image = pygame.transform.flip(globals.scaled_maze_wall_images.get((self.wall_type, self.orientation)),
-                                      self.mirror_x, self.mirror_y)
-        surface.blit(image, (self.position.x * block_size, self.position.y * block_size))
+        return wall_type, orientation, mirror_x, mirror_y
 
-    def copy(self):
-        new_block = super().copy()
-        new_block.wall_type = self.wall_type
-        new_block.orientation = self.orientation
-        return new_block
+    def draw(self, surface, block_size):
+        atlas = wall_tile_atlas(block_size)
+        surface.blit(atlas.surface, (self.position.x * block_size, self.position.y * block_size),
+                     atlas.area(self.grid, self.index))
 
 
 class BarrierBlock(MazeBlock):
@@ -896,8 +1265,21 @@ class BarrierBlock(MazeBlock):
 
     Parent (MazeBlock):
     """
+    __slots__ = ()
+
     block_type = MazeBlockType.BARRIER
 
     def draw(self, surface, block_size):
-        surface.blit(globals.scaled_maze_barrier_image,
-                     (self.position.x * block_size, self.position.y * block_size))
+        atlas = wall_tile_atlas(block_size)
+        surface.blit(atlas.surface, (self.position.x * block_size, self.position.y * block_size),
+                     atlas.area(self.grid, self.index))
+
+
+# Wall settings table keyed by packed empty, wall and barrier neighbour bitmasks, filled on first use
+# One 8-bit mask can't key it, as the rules tell empty, wall, barrier and path neighbours apart. Only a few dozen of
+# the 65536 combinations occur in generated mazes, so building them all on import would be wasted
+WALL_SETTINGS_TABLE = {}
+
+# Block view classes indexed by their block type value
+BLOCK_CLASSES = tuple(sorted((MazeBlock, WallBlock, PathBlock, BarrierBlock),
+                             key=lambda block_class: block_class.block_type.value))
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+
+import globals
+from maze_grid import *
+from settings import *
+
+# The number of tile variants of each wall type, one for every orientation and mirror flags combination
+WALL_TILE_VARIANTS = 16
+
+
+class WallTileAtlas:
+    """
+    Every wall, barrier and empty block tile pre-scaled to a block size and packed into one surface
+
+    Each wall type has a tile for every orientation and mirror flags combination, so drawing a wall is a single blit of
+    an area of the atlas
+
+    ...
+
+    Attributes:
+    -----------
+    block_size (int): The size of each tile in pixels
+    surface (Surface): The surface holding every tile
+    areas (list): The area of the atlas holding the tile of each tile key, or None for blocks with no tile
+
+    Methods:
+    --------
+    def area(self, grid, index):
+        Returns the area of the atlas holding the tile of a cell of a maze grid
+
+    Static Methods:
+    ---------------
+    def tile_key(block_type, wall_type, orientation, mirrors):
+        Returns the tile key of a block
+    """
+
+    def __init__(self, block_size):
+        """
+        Returns a new atlas of every block tile scaled to a block size
+
+        Parameters:
+            block_size (int): The size of each tile in pixels
+
+        Returns:
+            WallTileAtlas: A new wall tile atlas
+        """
+        self.block_size = block_size
+        size = (block_size, block_size)
+
+        tiles = {WallTileAtlas.tile_key(MazeBlockType.EMPTY.value, 0, 0, 0): None,
+                 WallTileAtlas.tile_key(MazeBlockType.BARRIER.value, 0, 0, 0):
+                     pygame.transform.smoothscale(globals.maze_barrier_image, size)}
+        for wall_type, image in globals.maze_wall_images.items():
+            for orientation in range(4):
+                # Rotate before scaling as the scaled tiles have always been scaled from the rotated images
+                scaled = pygame.transform.smoothscale(pygame.transform.rotate(image, orientation * 90), size)
+                for mirrors in range(4):
+                    tiles[WallTileAtlas.tile_key(MazeBlockType.WALL.value, wall_type.value, orientation, mirrors)] = \
+                        pygame.transform.flip(scaled, bool(mirrors & MIRROR_X), bool(mirrors & MIRROR_Y))
+
+        # Pack the tiles in rows of one wall type each
+        self.surface = create_surface((block_size * WALL_TILE_VARIANTS,
+                                       block_size * -(-len(tiles) // WALL_TILE_VARIANTS)))
+        self.areas = [None] * (len(BLOCK_TYPES) * len(WALL_TYPES) * WALL_TILE_VARIANTS)
+        for i, (key, tile) in enumerate(tiles.items()):
+            area = pygame.Rect(i % WALL_TILE_VARIANTS * block_size, i // WALL_TILE_VARIANTS * block_size, block_size,
+                               block_size)
+            if tile is None:
+                self.surface.fill(MAZE_EMPTY_COLOR, area)
+            else:
+                self.surface.blit(tile, area)
+            self.areas[key] = area
+
+    def area(self, grid, index):
+        """
+        Returns the area of the atlas holding the tile of a cell of a maze grid
+
+        Parameters:
+            grid (MazeGrid): The maze grid
+            index (int): The array index of the cell
+
+        Returns:
+            Rect: The area of the tile, or None if the block has no tile
+        """
+        return self.areas[WallTileAtlas.tile_key(grid.block_types[index], grid.wall_types[index],
+                                                 grid.wall_orientations[index], grid.wall_mirrors[index])]
+
+    @staticmethod
+    def tile_key(block_type, wall_type, orientation, mirrors):
+        """
+        Returns the tile key of a block
+
+        Only walls have a tile per wall type, orientation and mirror flags, so the wall settings of other blocks are
+        ignored
+
+        Parameters:
+            block_type (int): The MazeBlockType value of the block
+            wall_type (int): The BlockWallType value of the block
+            orientation (int): The number of 90 degree rotations of the block
+            mirrors (int): The MIRROR_X and MIRROR_Y flags of the block
+
+        Returns:
+            int: The tile key
+        """
+        if block_type != MazeBlockType.WALL.value:
+            return block_type * len(WALL_TYPES) * WALL_TILE_VARIANTS
+        return (block_type * len(WALL_TYPES) + wall_type) * WALL_TILE_VARIANTS + orientation * 4 + mirrors
+
+
+def wall_tile_atlas(block_size):
+    """
+    Returns the wall tile atlas of a block size, building it if it is not one of the most recently used sizes
+
+    Parameters:
+        block_size (int): The size of each tile in pixels
+
+    Returns:
+        WallTileAtlas: The wall tile atlas
+    """
+    atlas = WALL_TILE_ATLASES.get(block_size)
+    if atlas is None:
+        atlas = WallTileAtlas(block_size)
+        WALL_TILE_ATLASES[block_size] = atlas
+        # Drop the least recently used atlas
+        if len(WALL_TILE_ATLASES) > MAZE_ATLAS_CACHE_SIZE:
+            WALL_TILE_ATLASES.popitem(last=False)
+    else:
+        WALL_TILE_ATLASES.move_to_end(block_size)
+    return atlas
+
+
+# The wall tile atlases of the most recently used block sizes, least recently used first
+WALL_TILE_ATLASES = OrderedDict()
@@ -0,0 +1,140 @@
+import os
+
+# Keep the benchmark quiet when it imports pygame through the game modules
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from maze import *
+
+DEFAULT_BENCHMARK_SIZES = (9, 13, 25, 50, 75, 100, 150, 200)
+
+
+def time_generation(size, seeds):
+    """
+    Returns the median time taken to generate a maze of a size
+
+    Parameters:
+        size (int): The width and height of the maze in tiles
+        seeds (range, list): The seeds to generate a maze from
+
+    Returns:
+        tuple: The median time in seconds and the number of mazes rejected by validation
+    """
+    times = []
+    rejections = []
+    for seed in seeds:
+        start_time = time.perf_counter()
+        Maze.build_maze(random.Random(seed), rejections, size, size)
+        times.append(time.perf_counter() - start_time)
+    times.sort()
+    return times[len(times) // 2], len(rejections)
+
+
+def measure_memory(size, seed):
+    """
+    Returns the peak memory allocated while generating a maze of a size and the size of the finished grid
+
+    Parameters:
+        size (int): The width and height of the maze in tiles
+        seed (int): The seed to generate the maze from
+
+    Returns:
+        tuple: The peak memory and the memory held by the grid arrays in bytes
+    """
+    tracemalloc.start()
+    grid = Maze.build_maze(random.Random(seed), None, size, size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    grid_memory = sum(len(getattr(grid, name)) for name in ("block_types", "pickup_types", "pickups_consumed",
+                                                            "wall_types", "wall_orientations", "wall_mirrors"))
+    return peak, grid_memory
+
+
+def run_benchmark(sizes, repeats):
+    """
+    Measures the generation time and memory of every maze size
+
+    Parameters:
+        sizes (list): The maze widths and heights in tiles
+        repeats (int): The number of mazes generated per size to take the median time of
+
+    Returns:
+        list: The (size, tile count, median seconds, rejections, peak bytes, grid bytes) row of each size
+    """
+    # Build the preset placements of every size first so the first maze of a size isn't charged for them
+    for size in sizes:
+        preset_placements(size)
+
+    rows = []
+    for size in sizes:
+        seconds, rejections = time_generation(size, range(repeats))
+        peak, grid_memory = measure_memory(size, repeats)
+        rows.append((size, size * size, seconds, rejections, peak, grid_memory))
+        print(str(size) + "x" + str(size) + ": " + str(round(seconds * 1000, 2)) + "ms, " +
+              str(round(seconds * 1e6 / (size * size), 2)) + "us per tile, peak " + str(round(peak / 1024)) +
+              "KiB, grid " + str(round(grid_memory / 1024)) + "KiB, " + str(rejections) + " rejected")
+    return rows
+
+
+def growth_exponent(rows, column):
+    """
+    Returns the exponent k of the best fitting curve c * tiles ^ k through a column of the benchmark rows
+
+    Parameters:
+        rows (list): The benchmark rows
+        column (int): The index of the measured column
+
+    Returns:
+        float: The exponent, where 1 is linear in the number of tiles
+    """
+    # Least squares fit of a line through the log of the values
+    points = [(math.log(row[1]), math.log(row[column])) for row in rows]
+    mean_x = sum(x for x, y in points) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, y in points)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def write_csv(rows, path):
+    """
+    Writes the benchmark rows to a csv file
+
+    Parameters:
+        rows (list): The benchmark rows
+        path (str): The path of the csv file
+    """
+    file = open(path, "w")
+    file.write("size,tiles,median_ms,rejected,peak_bytes,grid_bytes\n")
+    for size, tiles, seconds, rejections, peak, grid_memory in rows:
+        file.write(",".join(str(value) for value in (size, tiles, round(seconds * 1000, 3), rejections, peak,
+                                                     grid_memory)) + "\n")
+    file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how maze generation time and memory grow with maze size")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_BENCHMARK_SIZES,
+                        help="the maze widths and heights in tiles to measure (default: 9 to 200)")
+    parser.add_argument("-r", "--repeats", type=int, default=5,
+                        help="the number of mazes generated per size to take the median time of")
+    parser.add_argument("--csv", default=None, help="write the measurements to a csv file")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.repeats)
+    if len(rows) > 1:
+        print("Time grows with tiles ^ " + str(round(growth_exponent(rows, 2), 2)) + ", peak memory with tiles ^ " +
+              str(round(growth_exponent(rows, 4), 2)))
+    if args.csv:
+        write_csv(rows, args.csv)
+
+
+if __name__ == '__main__':
+    main()
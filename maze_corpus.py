@@ -0,0 +1,323 @@
+import mmap
+import os
+import struct
+from array import array
+
+from maze_grid import *
+
+CORPUS_MAGIC = b"PMAZ"
+CORPUS_VERSION = 1
+
+# Magic, version, maze width, maze height, record count, index offset
+CORPUS_HEADER = struct.Struct("<4sHHHIQ")
+SEED_FORMAT = struct.Struct("<q")
+
+# The grid arrays stored in every record, in order
+RECORD_ARRAYS = ("block_types", "pickup_types", "wall_types", "wall_orientations", "wall_mirrors")
+
+
+def record_size(width, height):
+    """
+    Returns the size in bytes of a maze record
+
+    Parameters:
+        width (int): The width of the mazes in blocks
+        height (int): The height of the mazes in blocks
+
+    Returns:
+        int: The size of a record
+    """
+    return SEED_FORMAT.size + len(RECORD_ARRAYS) * (width + 2) * (height + 2)
+
+
+class MazeCorpusWriter:
+    """
+    Writes generated mazes to a corpus file
+
+    A corpus file is a header, a fixed size record per maze holding its seed and grid arrays, then an index of the seed
+    of every record. The header holds the maze size, the number of records and where the index starts. Records must be
+    added in increasing seed order so the record of a seed can be found by a binary search of the index.
+
+    ...
+
+    Attributes:
+    -----------
+    file (file): The corpus file being written
+    width (int): The width of the mazes in blocks
+    height (int): The height of the mazes in blocks
+    seeds (array): The seed of every record written so far
+
+    Methods:
+    --------
+    def check_seed(self, seed):
+        Checks a seed comes after the seed of the last record, as the index must stay sorted
+
+    def add(self, seed, grid):
+        Appends a maze to the corpus
+
+    def add_record(self, seed, data):
+        Appends the grid arrays of a maze record to the corpus
+
+    def close(self):
+        Writes the index and header and closes the file
+    """
+
+    def __init__(self, path, width, height):
+        """
+        Returns a new maze corpus writer which starts an empty corpus file
+
+        Parameters:
+            path (str): The path of the corpus file
+            width (int): The width of the mazes in blocks
+            height (int): The height of the mazes in blocks
+
+        Returns:
+            MazeCorpusWriter: A new maze corpus writer
+        """
+        self.file = open(path, "wb")
+        self.width = width
+        self.height = height
+        self.seeds = array("q")
+        # Leave room for the header until the record count is known
+        self.file.write(bytes(CORPUS_HEADER.size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def check_seed(self, seed):
+        """
+        Checks a seed comes after the seed of the last record, as the index must stay sorted
+
+        Parameters:
+            seed (int): The seed of the record being added
+        """
+        if self.seeds and seed <= self.seeds[-1]:
+            raise ValueError("seed " + str(seed) + " added after seed " + str(self.seeds[-1]) +
+                             ", corpus records must be added in increasing seed order")
+
+    def add(self, seed, grid):
+        """
+        Appends a maze to the corpus
+
+        Parameters:
+            seed (int): The seed the maze was generated from
+            grid (MazeGrid): The grid of the maze
+        """
+        if grid.width != self.width or grid.height != self.height:
+            raise ValueError("maze is " + str(grid.width) + "x" + str(grid.height) + " but the corpus holds " +
+                             str(self.width) + "x" + str(self.height) + " mazes")
+        self.check_seed(seed)
+
+        self.file.write(SEED_FORMAT.pack(seed))
+        for name in RECORD_ARRAYS:
+            self.file.write(getattr(grid, name))
+        self.seeds.append(seed)
+
+    def add_record(self, seed, data):
+        """
+        Appends the grid arrays of a maze record to the corpus
+
+        Parameters:
+            seed (int): The seed the maze was generated from
+            data (bytes): The grid arrays of the record, as returned by MazeCorpus.record_data
+        """
+        if len(data) != record_size(self.width, self.height) - SEED_FORMAT.size:
+            raise ValueError("record holds " + str(len(data)) + " bytes but the corpus records hold " +
+                             str(record_size(self.width, self.height) - SEED_FORMAT.size))
+        self.check_seed(seed)
+
+        self.file.write(SEED_FORMAT.pack(seed))
+        self.file.write(data)
+        self.seeds.append(seed)
+
+    def close(self):
+        """
+        Writes the index and header and closes the file
+        """
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(self.seeds.tobytes())
+        self.file.seek(0)
+        self.file.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, self.width, self.height, len(self.seeds),
+                                           index_offset))
+        self.file.close()
+
+
+class MazeCorpus:
+    """
+    Reads mazes from a memory mapped corpus file in constant time
+
+    ...
+
+    Attributes:
+    -----------
+    file (file): The open corpus file
+    data (mmap): The memory mapped contents of the corpus file
+    width (int): The width of the mazes in blocks
+    height (int): The height of the mazes in blocks
+    count (int): The number of records
+    index_offset (int): Where the seed index starts in the file
+    record_size (int): The size in bytes of each record
+
+    Methods:
+    --------
+    def seed(self, record):
+        Returns the seed of a record
+
+    def record_data(self, record):
+        Returns the grid arrays of a record as they are stored
+
+    def grid(self, record):
+        Returns the maze grid of a record
+
+    def record_for_seed(self, seed):
+        Returns the record number of a seed
+
+    def grid_for_seed(self, seed):
+        Returns the maze grid generated from a seed
+
+    def close(self):
+        Closes the corpus file
+    """
+
+    def __init__(self, path):
+        """
+        Returns a maze corpus reading from a corpus file
+
+        Parameters:
+            path (str): The path of the corpus file
+
+        Returns:
+            MazeCorpus: A new maze corpus
+        """
+        self.file = open(path, "rb")
+        # An empty file can't be mapped, so check there is at least a header first
+        size = os.fstat(self.file.fileno()).st_size
+        if size < CORPUS_HEADER.size:
+            self.file.close()
+            raise ValueError(path + " is too short to be a maze corpus")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.width, self.height, self.count, self.index_offset = CORPUS_HEADER.unpack_from(self.data, 0)
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            self.close()
+            raise ValueError(path + " is not a version " + str(CORPUS_VERSION) + " maze corpus")
+
+        # The records sit between the header and the index, so the header gives the exact length of the file
+        self.record_size = record_size(self.width, self.height)
+        if (self.index_offset != CORPUS_HEADER.size + self.count * self.record_size or
+                size < self.index_offset + self.count * SEED_FORMAT.size):
+            self.close()
+            raise ValueError(path + " is truncated or has a corrupt header")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of mazes in the corpus
+
+        Returns:
+            int: The number of mazes
+        """
+        return self.count
+
+    def seed(self, record):
+        """
+        Returns the seed of a record
+
+        Parameters:
+            record (int): The record number
+
+        Returns:
+            int: The seed of the record
+        """
+        if not 0 <= record < self.count:
+            raise IndexError("maze corpus record " + str(record) + " out of range")
+
+        return SEED_FORMAT.unpack_from(self.data, self.index_offset + record * SEED_FORMAT.size)[0]
+
+    def record_data(self, record):
+        """
+        Returns the grid arrays of a record as they are stored
+
+        Parameters:
+            record (int): The record number
+
+        Returns:
+            bytes: The grid arrays in the order of RECORD_ARRAYS
+        """
+        if not 0 <= record < self.count:
+            raise IndexError("maze corpus record " + str(record) + " out of range")
+
+        start = CORPUS_HEADER.size + record * self.record_size + SEED_FORMAT.size
+        return self.data[start:start + self.record_size - SEED_FORMAT.size]
+
+    def grid(self, record):
+        """
+        Returns the maze grid of a record
+
+        Parameters:
+            record (int): The record number
+
+        Returns:
+            MazeGrid: A new maze grid holding a copy of the record
+        """
+        if not 0 <= record < self.count:
+            raise IndexError("maze corpus record " + str(record) + " out of range")
+
+        grid = MazeGrid(self.width, self.height)
+        cells = len(grid.block_types)
+        start = CORPUS_HEADER.size + record * self.record_size + SEED_FORMAT.size
+        for name in RECORD_ARRAYS:
+            setattr(grid, name, bytearray(self.data[start:start + cells]))
+            start += cells
+        return grid
+
+    def record_for_seed(self, seed):
+        """
+        Returns the record number of a seed by a binary search of the seed index
+
+        Parameters:
+            seed (int): The seed
+
+        Returns:
+            int: The record number of the seed
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.seed(middle) < seed:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.count or self.seed(low) != seed:
+            raise KeyError("seed " + str(seed) + " is not in the maze corpus")
+        return low
+
+    def grid_for_seed(self, seed):
+        """
+        Returns the maze grid generated from a seed
+
+        Parameters:
+            seed (int): The seed
+
+        Returns:
+            MazeGrid: A new maze grid holding a copy of the record of the seed
+        """
+        return self.grid(self.record_for_seed(seed))
+
+    def close(self):
+        """
+        Closes the corpus file
+        """
+        self.data.close()
+        self.file.close()
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import multiprocessing
+import os
+import struct
+import time
+
+from maze_corpus import *
+
+FINGERPRINT_SIZE = 16
+
+INDEX_MAGIC = b"PFPI"
+INDEX_VERSION = 1
+
+# Magic, version, fingerprint size
+INDEX_HEADER = struct.Struct("<4sHH")
+MAZE_SIZE_FORMAT = struct.Struct("<HH")
+
+
+def fingerprint_cells(width, height, cells):
+    """
+    Returns the fingerprint of the block and pickup arrays of a maze
+
+    Generated mazes are always left-right symmetric, so the arrays are hashed as they are with no mirror image to match
+
+    Parameters:
+        width (int): The width of the maze in blocks
+        height (int): The height of the maze in blocks
+        cells (bytes): The block type array followed by the pickup type array, including the border cells
+
+    Returns:
+        bytes: The fingerprint
+    """
+    fingerprint = hashlib.blake2b(MAZE_SIZE_FORMAT.pack(width, height), digest_size=FINGERPRINT_SIZE)
+    fingerprint.update(cells)
+    return fingerprint.digest()
+
+
+def maze_fingerprint(grid):
+    """
+    Returns the fingerprint of a maze grid
+
+    Parameters:
+        grid (MazeGrid): The maze grid
+
+    Returns:
+        bytes: The fingerprint
+    """
+    return fingerprint_cells(grid.width, grid.height, grid.block_types + grid.pickup_types)
+
+
+def record_fingerprint(corpus, record):
+    """
+    Returns the fingerprint of a corpus record without building its grid
+
+    Parameters:
+        corpus (MazeCorpus): The corpus
+        record (int): The record number
+
+    Returns:
+        bytes: The fingerprint
+    """
+    # The block types and pickup types are the first two arrays of a record
+    cells = (corpus.width + 2) * (corpus.height + 2)
+    return fingerprint_cells(corpus.width, corpus.height, corpus.record_data(record)[:cells * 2])
+
+
+class FingerprintIndex:
+    """
+    A set of maze fingerprints backed by an append only index file
+
+    ...
+
+    Attributes:
+    -----------
+    path (str): The path of the index file, or None to only keep the fingerprints in memory
+    file (file): The index file open for appending, or None if in memory
+    fingerprints (set): The fingerprints in the index
+
+    Methods:
+    --------
+    def add(self, fingerprint):
+        Adds a fingerprint to the index if it is not already in it
+
+    def close(self):
+        Flushes and closes the index file
+    """
+
+    def __init__(self, path=None):
+        """
+        Returns a fingerprint index holding the fingerprints in the index file, which is created if it doesn't exist
+
+        Parameters:
+            path (str): The path of the index file, or None to only keep the fingerprints in memory (Default: None)
+
+        Returns:
+            FingerprintIndex: A new fingerprint index
+        """
+        self.path = path
+        self.file = None
+        self.fingerprints = set()
+        if path is None:
+            return
+
+        if os.path.exists(path):
+            file = open(path, "rb")
+            data = file.read()
+            file.close()
+
+            if len(data) < INDEX_HEADER.size or INDEX_HEADER.unpack_from(data) != (INDEX_MAGIC, INDEX_VERSION,
+                                                                                   FINGERPRINT_SIZE):
+                raise ValueError(path + " is not a version " + str(INDEX_VERSION) + " maze fingerprint index")
+
+            # Drop a fingerprint left partly written by an interrupted run so the appends stay aligned
+            end = len(data) - (len(data) - INDEX_HEADER.size) % FINGERPRINT_SIZE
+            self.fingerprints = {data[start:start + FINGERPRINT_SIZE] for start in
+                                 range(INDEX_HEADER.size, end, FINGERPRINT_SIZE)}
+            if end != len(data):
+                os.truncate(path, end)
+        else:
+            file = open(path, "wb")
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, FINGERPRINT_SIZE))
+            file.close()
+
+        self.file = open(path, "ab")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of fingerprints in the index
+
+        Returns:
+            int: The number of fingerprints
+        """
+        return len(self.fingerprints)
+
+    def __contains__(self, fingerprint):
+        """
+        Returns whether a fingerprint is in the index
+
+        Parameters:
+            fingerprint (bytes): The fingerprint
+
+        Returns:
+            bool: Whether the fingerprint is in the index
+        """
+        return fingerprint in self.fingerprints
+
+    def add(self, fingerprint):
+        """
+        Adds a fingerprint to the index if it is not already in it
+
+        Parameters:
+            fingerprint (bytes): The fingerprint
+
+        Returns:
+            bool: Whether the fingerprint was added, which is False for a duplicate
+        """
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        if self.file:
+            self.file.write(fingerprint)
+        return True
+
+    def close(self):
+        """
+        Flushes and closes the index file
+        """
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def fingerprint_chunk(chunk):
+    """
+    Returns the fingerprints of a chunk of the records of a corpus file
+
+    Parameters:
+        chunk (tuple): The path of the corpus file, the first record and the record after the last record
+
+    Returns:
+        list: The fingerprint of each record
+    """
+    path, start, stop = chunk
+    with MazeCorpus(path) as corpus:
+        return [record_fingerprint(corpus, record) for record in range(start, stop)]
+
+
+def dedupe_corpus(source_path, target_path, index_path=None, processes=None, chunk_size=4096):
+    """
+    Writes the records of a corpus file whose mazes aren't duplicates to a new corpus file
+
+    The records are fingerprinted in chunks across a process pool with each worker mapping the corpus file itself, so
+    only the fingerprints are sent between processes
+
+    Parameters:
+        source_path (str): The path of the corpus file to dedupe
+        target_path (str): The path of the corpus file to write
+        index_path (str): The fingerprint index of the mazes already kept elsewhere, which the kept mazes are added to
+        (Default: None)
+        processes (int): The number of worker processes (Default: one per cpu)
+        chunk_size (int): The number of records handed to a worker at a time (Default: 4096)
+
+    Returns:
+        tuple: The number of records kept and the number of duplicates dropped
+    """
+    source = MazeCorpus(source_path)
+    kept = 0
+    duplicates = 0
+    try:
+        chunks = [(source_path, start, min(start + chunk_size, len(source))) for start in
+                  range(0, len(source), chunk_size)]
+
+        with FingerprintIndex(index_path) as index, MazeCorpusWriter(target_path, source.width,
+                                                                     source.height) as target:
+            with multiprocessing.Pool(processes) as pool:
+                for (path, start, stop), fingerprints in zip(chunks, pool.imap(fingerprint_chunk, chunks)):
+                    for record, fingerprint in zip(range(start, stop), fingerprints):
+                        if index.add(fingerprint):
+                            target.add_record(source.seed(record), source.record_data(record))
+                            kept += 1
+                        else:
+                            duplicates += 1
+    finally:
+        # Unmap and close the source corpus even if deduping fails part way through
+        source.close()
+    return kept, duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate mazes from a maze corpus")
+    parser.add_argument("source", help="the corpus file to dedupe")
+    parser.add_argument("target", help="the corpus file to write the unique mazes to")
+    parser.add_argument("-i", "--index", default=None,
+                        help="a fingerprint index of mazes kept elsewhere, which the unique mazes are added to")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="the number of worker processes (default: one per cpu)")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    kept, duplicates = dedupe_corpus(args.source, args.target, args.index, args.processes)
+    elapsed = time.perf_counter() - start_time
+    print("Kept " + str(kept) + " mazes and dropped " + str(duplicates) + " duplicates in " +
+          str(round(elapsed, 2)) + "s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import os
+
+# Keep the worker processes quiet when they import pygame through the game modules
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import multiprocessing
+import pickle
+import random
+import time
+from collections import Counter
+
+from maze import *
+from maze_fingerprint import *
+
+
+def generate(seed, rejections=None):
+    """
+    Generates a maze from a seed without needing a running game
+
+    Parameters:
+        seed (int): The seed of the maze
+        rejections (list): The list to add the report of every maze rejected by validation to (Default: None)
+
+    Returns:
+        MazeGrid: The grid of blocks making up the maze
+    """
+    return Maze.build_maze(random.Random(seed), rejections)
+
+
+def generate_batch(seeds):
+    """
+    Generates the mazes for a batch of seeds
+
+    Parameters:
+        seeds (range, list): The seeds to generate mazes for
+
+    Returns:
+        tuple: The list of (seed, maze, fingerprint) of each maze and the list of reports of the rejected mazes
+    """
+    rejections = []
+    mazes = []
+    for seed in seeds:
+        maze = generate(seed, rejections)
+        mazes.append((seed, maze, maze_fingerprint(maze)))
+    return mazes, rejections
+
+
+def split_seeds(start, count, chunk_size):
+    """
+    Splits a range of seeds into chunks for the worker processes
+
+    Parameters:
+        start (int): The first seed
+        count (int): The number of seeds
+        chunk_size (int): The maximum number of seeds in a chunk
+
+    Returns:
+        list: The list of seed ranges
+    """
+    end = start + count
+    return [range(chunk_start, min(chunk_start + chunk_size, end)) for chunk_start in range(start, end, chunk_size)]
+
+
+def maze_file_path(output_path, seed):
+    """
+    Returns the path of the file a maze is written to
+
+    Parameters:
+        output_path (str): The directory the mazes are written to
+        seed (int): The seed of the maze
+
+    Returns:
+        str: The path of the maze file
+    """
+    return os.path.join(output_path, "maze_" + str(seed) + ".pickle")
+
+
+def run_batch(start, count, output_path, processes=None, chunk_size=64, corpus_path=None, index_path=None):
+    """
+    Generates a range of seeds across a process pool and writes every maze to the output directory or a corpus file
+
+    Mazes that are the same as a maze already written, in this batch or in the fingerprint index, are skipped
+
+    Parameters:
+        start (int): The first seed
+        count (int): The number of seeds
+        output_path (str): The directory to write the mazes to
+        processes (int): The number of worker processes (Default: one per cpu)
+        chunk_size (int): The number of seeds handed to a worker at a time (Default: 64)
+        corpus_path (str): The corpus file to write the mazes to instead of the output directory (Default: None)
+        index_path (str): The fingerprint index of the mazes already written, which the written mazes are added to
+        (Default: None)
+
+    Returns:
+        tuple: The number of mazes written, the number of duplicate mazes skipped and the list of reports of the mazes
+        rejected by validation
+    """
+    written = 0
+    duplicates = 0
+    rejections = []
+    corpus = None
+    index = None
+    try:
+        if corpus_path:
+            corpus = MazeCorpusWriter(corpus_path, MAZE_WIDTH, MAZE_HEIGHT)
+        else:
+            os.makedirs(output_path, exist_ok=True)
+        index = FingerprintIndex(index_path)
+
+        with multiprocessing.Pool(processes) as pool:
+            # Chunks come back in seed order so record N of a corpus is the maze of seed start + N
+            # They are written as soon as they are ready so memory stays bounded by the chunk size
+            for batch, batch_rejections in pool.imap(generate_batch, split_seeds(start, count, chunk_size)):
+                rejections += batch_rejections
+                for seed, maze, fingerprint in batch:
+                    if not index.add(fingerprint):
+                        duplicates += 1
+                        continue
+
+                    if corpus:
+                        corpus.add(seed, maze)
+                    else:
+                        file = open(maze_file_path(output_path, seed), "wb")
+                        pickle.dump(maze, file)
+                        file.close()
+                    written += 1
+    finally:
+        # Close the index and corpus even if generation fails, so the mazes written so far are kept readable
+        if index is not None:
+            index.close()
+        if corpus is not None:
+            corpus.close()
+    return written, duplicates, rejections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate pac-man mazes in bulk from a range of seeds")
+    parser.add_argument("start", type=int, help="the first seed to generate")
+    parser.add_argument("count", type=int, help="the number of seeds to generate")
+    parser.add_argument("-o", "--output", default=os.path.join(SAVE_FILE_PATH, "Mazes"),
+                        help="the directory to write the mazes to")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="the number of worker processes (default: one per cpu)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=64,
+                        help="the number of seeds handed to a worker at a time")
+    parser.add_argument("--corpus", default=None,
+                        help="write the mazes to a single memory mappable corpus file instead of the output directory")
+    parser.add_argument("-i", "--index", default=None,
+                        help="a fingerprint index of mazes already generated, which the new mazes are added to")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    written, duplicates, rejections = run_batch(args.start, args.count, args.output, args.processes,
+                                                args.chunk_size, args.corpus, args.index)
+    elapsed = time.perf_counter() - start_time
+    print("Generated " + str(written) + " mazes in " + str(round(elapsed, 2)) + "s")
+    print("Skipped " + str(duplicates) + " duplicate mazes")
+
+    # Report how often validation threw a maze away and why
+    # Duplicates passed validation too, they were just not written
+    candidates = written + duplicates + len(rejections)
+    print("Rejected " + str(len(rejections)) + " of " + str(candidates) + " candidate mazes (" +
+          str(round(len(rejections) / max(candidates, 1) * 100, 2)) + "%)")
+    problems = Counter(problem for report in rejections for problem in report.problems())
+    for problem, problem_count in problems.most_common():
+        print("    " + problem + ": " + str(problem_count))
+
+
+if __name__ == '__main__':
+    main()
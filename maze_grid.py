@@ -0,0 +1,200 @@
+from enum_types import *
+
+# Enum members indexed by their stored byte value
+BLOCK_TYPES = tuple(sorted(MazeBlockType, key=lambda member: member.value))
+PICKUP_TYPES = tuple(sorted(BlockPickupType, key=lambda member: member.value))
+WALL_TYPES = tuple(sorted(BlockWallType, key=lambda member: member.value))
+
+# Wall mirror bit flags
+MIRROR_X = 1
+MIRROR_Y = 2
+
+# The direction and offset of each neighbour, in the order of their bits in a neighbour bitmask
+NEIGHBOUR_OFFSETS = (("TL", -1, -1), ("L", -1, 0), ("BL", -1, 1), ("B", 0, 1),
+                     ("BR", 1, 1), ("R", 1, 0), ("TR", 1, -1), ("T", 0, -1))
+
+
+class MazeGrid:
+    """
+    A compact maze grid that stores every block in flat byte arrays
+
+    The cells are stored row by row with a one cell border of empty sentinel cells around the maze, so the neighbours of
+    every maze cell are valid indices. Any point further outside the maze maps onto the sentinel cell at index 0.
+
+    ...
+
+    Attributes:
+    -----------
+    width (int): The width of the maze in blocks
+    height (int): The height of the maze in blocks
+    stride (int): The number of cells in a stored row, including the border
+    block_types (bytearray): The MazeBlockType value of each cell
+    pickup_types (bytearray): The BlockPickupType value of each cell
+    pickups_consumed (bytearray): Whether the pickup of each cell has been consumed
+    wall_types (bytearray): The BlockWallType value of each cell
+    wall_orientations (bytearray): The number of 90 degree rotations of each wall
+    wall_mirrors (bytearray): The MIRROR_X and MIRROR_Y flags of each wall
+
+    Methods:
+    --------
+    def index(self, x, y):
+        Returns the array index of the cell at a position
+
+    def position(self, index):
+        Returns the position of the cell at an array index
+
+    def indices(self):
+        Returns the array indices of every maze cell row by row
+
+    def block_type(self, x, y):
+        Returns the block type at a position
+
+    def set_block_type(self, x, y, block_type):
+        Sets the block type at a position
+
+    def neighbour_masks(self, block_type):
+        Returns the bitmask of the neighbours of every cell which are of a block type
+
+    def mirrored(self, width):
+        Returns a grid made of the first columns of this grid followed by their mirror image
+    """
+
+    def __init__(self, width, height):
+        """
+        Returns a new maze grid filled with empty blocks
+
+        Parameters:
+            width (int): The width of the maze in blocks
+            height (int): The height of the maze in blocks
+
+        Returns:
+            MazeGrid: A new maze grid
+        """
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+
+        size = self.stride * (height + 2)
+        self.block_types = bytearray(size)
+        self.pickup_types = bytearray(size)
+        self.pickups_consumed = bytearray(size)
+        self.wall_types = bytearray(size)
+        self.wall_orientations = bytearray(size)
+        self.wall_mirrors = bytearray(size)
+
+    def index(self, x, y):
+        """
+        Returns the array index of the cell at a position
+
+        Parameters:
+            x (int): The x coordinate
+            y (int): The y coordinate
+
+        Returns:
+            int: The array index of the cell, or the sentinel index 0 if the position is outside the border
+        """
+        if -1 <= x <= self.width and -1 <= y <= self.height:
+            return (y + 1) * self.stride + x + 1
+        else:
+            return 0
+
+    def position(self, index):
+        """
+        Returns the position of the cell at an array index
+
+        Parameters:
+            index (int): The array index
+
+        Returns:
+            tuple: The x and y coordinates of the cell
+        """
+        return index % self.stride - 1, index // self.stride - 1
+
+    def indices(self):
+        """
+        Returns the array indices of every maze cell row by row
+
+        Returns:
+            generator: The array indices
+        """
+        for y in range(self.height):
+            row_start = (y + 1) * self.stride + 1
+            yield from range(row_start, row_start + self.width)
+
+    def block_type(self, x, y):
+        """
+        Returns the block type at a position
+
+        Parameters:
+            x (int): The x coordinate
+            y (int): The y coordinate
+
+        Returns:
+            MazeBlockType: The block type
+        """
+        return BLOCK_TYPES[self.block_types[self.index(x, y)]]
+
+    def set_block_type(self, x, y, block_type):
+        """
+        Sets the block type at a position
+
+        Parameters:
+            x (int): The x coordinate, which must be within the maze
+            y (int): The y coordinate, which must be within the maze
+            block_type (MazeBlockType): The new block type
+        """
+        self.block_types[(y + 1) * self.stride + x + 1] = block_type.value
+
+    def neighbour_masks(self, block_type):
+        """
+        Returns the bitmask of the neighbours of every cell which are of a block type
+
+        The whole grid is handled at once by treating the cells as the bytes of one integer, so each neighbour is a
+        single shift of that integer
+
+        Parameters:
+            block_type (MazeBlockType): The block type to look for
+
+        Returns:
+            bytearray: The neighbour bitmask of each cell, with bits in the order of NEIGHBOUR_OFFSETS
+        """
+        size = len(self.block_types)
+
+        # Turn the block types into a byte of 1 for every cell of the block type
+        table = bytearray(256)
+        table[block_type.value] = 1
+        cells = int.from_bytes(self.block_types.translate(table), "little")
+
+        masks = 0
+        for bit, (direction, dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+            # Shift the neighbour of every cell onto the cell
+            offset = (dy * self.stride + dx) * 8
+            neighbours = cells >> offset if offset > 0 else cells << -offset
+            masks |= neighbours << bit
+
+        # Cut off the neighbours shifted past the last cell
+        masks &= (1 << size * 8) - 1
+        return bytearray(masks.to_bytes(size, "little"))
+
+    def mirrored(self, width):
+        """
+        Returns a grid made of the first columns of this grid followed by their mirror image
+
+        Parameters:
+            width (int): The number of columns to keep and mirror
+
+        Returns:
+            MazeGrid: The mirrored grid which is twice the width
+        """
+        grid = MazeGrid(width * 2, self.height)
+        for source, target in ((self.block_types, grid.block_types), (self.pickup_types, grid.pickup_types),
+                               (self.pickups_consumed, grid.pickups_consumed), (self.wall_types, grid.wall_types),
+                               (self.wall_orientations, grid.wall_orientations),
+                               (self.wall_mirrors, grid.wall_mirrors)):
+            for y in range(self.height):
+                source_start = (y + 1) * self.stride + 1
+                target_start = (y + 1) * grid.stride + 1
+                row = source[source_start:source_start + width]
+                target[target_start:target_start + width] = row
+                target[target_start + width:target_start + width * 2] = row[::-1]
+        return grid
@@ -0,0 +1,90 @@
+import random
+
+from maze_grid import *
+
+
+class PickupIndex:
+    """
+    Keeps count of the pickups left in a maze grid and which path blocks have had their pickup consumed
+
+    The counts are kept up to date as pickups are consumed, so nothing needs to scan the grid once the index is built
+
+    ...
+
+    Attributes:
+    -----------
+    grid (MazeGrid): The maze grid the pickups are in
+    remaining (int): The number of path blocks whose pickup has not been consumed
+    consumed (list): The array indices of the path blocks whose pickup has been consumed
+
+    Methods:
+    --------
+    def consume(self, index):
+        Consumes the pickup of the path block at an array index
+
+    def spawn_fruit(self, rng=random):
+        Puts a fruit on a random path block whose pickup has been consumed
+    """
+
+    def __init__(self, grid):
+        """
+        Returns a new pickup index holding the pickups of a maze grid
+
+        Parameters:
+            grid (MazeGrid): The maze grid
+
+        Returns:
+            PickupIndex: A new pickup index
+        """
+        self.grid = grid
+        self.remaining = 0
+        self.consumed = []
+
+        path = MazeBlockType.PATH.value
+        for index in grid.indices():
+            if grid.block_types[index] == path:
+                if grid.pickups_consumed[index]:
+                    self.consumed.append(index)
+                else:
+                    self.remaining += 1
+
+    def consume(self, index):
+        """
+        Consumes the pickup of the path block at an array index
+
+        Parameters:
+            index (int): The array index of the path block
+
+        Returns:
+            bool: Whether there was a pickup to consume
+        """
+        if self.grid.pickups_consumed[index]:
+            return False
+        self.grid.pickups_consumed[index] = True
+        self.consumed.append(index)
+        self.remaining -= 1
+        return True
+
+    def spawn_fruit(self, rng=random):
+        """
+        Puts a fruit on a random path block whose pickup has been consumed
+
+        Parameters:
+            rng (Random): The random number generator to choose the block with (Default: random)
+
+        Returns:
+            int: The array index of the block the fruit was put on, or None if no pickups have been consumed
+        """
+        if not self.consumed:
+            return None
+
+        # Move the last consumed block into the place of the chosen block so it is removed in constant time
+        position = rng.randrange(len(self.consumed))
+        index = self.consumed[position]
+        self.consumed[position] = self.consumed[-1]
+        self.consumed.pop()
+
+        self.grid.pickup_types[index] = BlockPickupType.FRUIT.value
+        self.grid.pickups_consumed[index] = False
+        self.remaining += 1
+        return index
@@ -0,0 +1,115 @@
+import multiprocessing
+import queue
+import random
+
+# Seconds between checks that the worker is still running while waiting for a maze
+WORKER_POLL_TIME = 0.5
+
+
+def build_mazes(build, seed, mazes):
+    """
+    Builds mazes forever on a worker process, waiting whenever the queue is full
+
+    Parameters:
+        build (function): The function building a maze from a random number generator
+        seed (int): The seed of the random number generator the seed of each maze is drawn from
+        mazes (Queue): The queue to put the built mazes on
+    """
+    rng = random.Random(seed)
+    while True:
+        try:
+            maze = build(random.Random(rng.getrandbits(64)))
+        except Exception as error:
+            # Hand the error to the game instead of leaving it waiting on a maze that never comes
+            mazes.put(error)
+            return
+        mazes.put(maze)
+
+
+class MazePrefetcher:
+    """
+    Builds mazes ahead of time on a worker process and holds them in a bounded queue
+
+    The worker builds mazes until the queue is full, then waits for a maze to be taken before building another, so the
+    next level is ready long before it is needed. Building on a separate process keeps the generation from competing
+    with the game loop for the interpreter lock.
+
+    ...
+
+    Attributes:
+    -----------
+    build (function): The function building a maze from a random number generator
+    context (BaseContext): The multiprocessing context the worker is started with
+    mazes (Queue): The built mazes waiting to be taken
+    seed (int): The seed the worker draws the seed of each maze from
+    process (Process): The worker process, or None if it has not been started
+
+    Methods:
+    --------
+    def start(self):
+        Starts building mazes on the worker process if it is not already running
+
+    def get(self, block=True):
+        Returns the next built maze
+    """
+
+    def __init__(self, build, count):
+        """
+        Returns a new maze prefetcher which has not started building mazes
+
+        Parameters:
+            build (function): The function building a maze from a random number generator, which must be picklable
+            count (int): The maximum number of mazes to build ahead
+
+        Returns:
+            MazePrefetcher: A new maze prefetcher
+        """
+        self.build = build
+        # Spawn the worker rather than forking it, as forking a process already running the sdl threads can deadlock
+        self.context = multiprocessing.get_context("spawn")
+        self.mazes = self.context.Queue(count)
+        # Draw the seed from the random module so seeding it still makes the levels reproducible
+        self.seed = random.getrandbits(64)
+        self.process = None
+
+    def start(self):
+        """
+        Starts building mazes on the worker process if it is not already running
+        """
+        if self.process is None:
+            self.process = self.context.Process(target=build_mazes, args=(self.build, self.seed, self.mazes),
+                                                name="MazePrefetcher", daemon=True)
+            self.process.start()
+
+    def get(self, block=True):
+        """
+        Returns the next built maze
+
+        Raises a RuntimeError if the worker has stopped without a maze being ready, as none will ever come
+
+        Parameters:
+            block (bool): Whether to wait for a maze if none are ready (Default: True)
+
+        Returns:
+            MazeGrid: The next maze, or None if none are ready and block is False
+        """
+        self.start()
+        while True:
+            try:
+                maze = self.mazes.get(block, WORKER_POLL_TIME)
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    # Take a maze put on the queue just before the worker stopped
+                    try:
+                        maze = self.mazes.get_nowait()
+                        break
+                    except queue.Empty:
+                        raise RuntimeError("the maze prefetcher worker stopped with exit code " +
+                                           str(self.process.exitcode))
+                if not block:
+                    return None
+
+        if isinstance(maze, Exception):
+            raise maze
+        return maze
@@ -0,0 +1,230 @@
+import hashlib
+import struct
+
+from maze_tiler import *
+from settings import *
+
+PRESET_CACHE_MAGIC = b"PPRE"
+PRESET_CACHE_VERSION = 1
+
+# Magic, version, shape presets hash, preset count
+PRESET_CACHE_HEADER = struct.Struct("<4sH16sH")
+
+# The piece preset table shipped in the saves folder, found from this file so it doesn't depend on the working directory
+PIECE_PRESETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), SAVE_FILE_PATH, PIECE_PRESETS_FILE)
+
+# Direction to tile offset translate dictionary
+DIRECTION_OFFSETS = {"L": (-1, 0), "R": (1, 0), "U": (0, 1), "D": (0, -1)}
+
+
+def shape_presets_key(shape_presets):
+    """
+    Returns the hash identifying a list of piece shape presets
+
+    Parameters:
+        shape_presets (list): The list of direction paths of each shape preset
+
+    Returns:
+        bytes: The 16 byte hash of the shape presets
+    """
+    return hashlib.blake2b(repr(shape_presets).encode(), digest_size=16).digest()
+
+
+def piece_outline(tiles):
+    """
+    Returns the tile corners on the edge of a piece, in order clockwise from the left most lowest corner
+
+    Two tiles of a piece only touch at a corner where the piece closes around an empty area, so the outline keeps to the
+    tile it arrived along there, going around that area as well and passing through the corner twice. An empty area
+    enclosed without such a corner can't be reached from the outline
+
+    Parameters:
+        tiles (set): The (x, y) tile points of the piece
+
+    Returns:
+        list: The (x, y) tile corners of the outline
+    """
+    # Map each tile corner on the edge of the piece to the corners going clockwise around the piece from it
+    # A tile side is on the edge if there is no tile on the other side of it
+    next_corners = {}
+    for x, y in tiles:
+        if (x, y - 1) not in tiles:
+            next_corners.setdefault((x, y), []).append((x + 1, y))
+        if (x + 1, y) not in tiles:
+            next_corners.setdefault((x + 1, y), []).append((x + 1, y + 1))
+        if (x, y + 1) not in tiles:
+            next_corners.setdefault((x + 1, y + 1), []).append((x, y + 1))
+        if (x - 1, y) not in tiles:
+            next_corners.setdefault((x, y + 1), []).append((x, y))
+    sides = sum(len(corners) for corners in next_corners.values())
+
+    # Start at the left most lowest corner, which only one side leaves, and walk the edge until arriving back at it
+    start_corner = min(next_corners)
+    previous = corner = start_corner
+    outline = []
+    while True:
+        outline.append(corner)
+        corners = next_corners[corner]
+        next_corner = corners[0]
+        if len(corners) > 1:
+            # Two sides leave a corner where tiles only touch diagonally, so turn right to keep to the same tile
+            next_corner = (corner[0] - corner[1] + previous[1], corner[1] + corner[0] - previous[0])
+        corners.remove(next_corner)
+        previous, corner = corner, next_corner
+        if corner == start_corner:
+            break
+
+    if len(outline) != sides:
+        raise ValueError("piece " + str(sorted(tiles)) + " has a hole its outline can't go around")
+    return outline
+
+
+def build_piece_presets(shape_presets):
+    """
+    Builds every rotation of a list of piece shape presets
+
+    Parameters:
+        shape_presets (list): The list of direction paths of each shape preset
+
+    Returns:
+        tuple: The (x, y) tile points of each piece preset
+    """
+    presets = []
+    for paths in shape_presets:
+        # The points are kept in the iteration order of a set, which is the order the presets have always used
+        points = {(0, 0)}
+        for path in paths:
+            x = y = 0
+            for direction in path:
+                dx, dy = DIRECTION_OFFSETS[direction]
+                x += dx
+                y += dy
+            points.add((x, y))
+        # Raise for shapes the maze pieces can't be outlined from
+        piece_outline(points)
+
+        # Add each 90 degree clockwise rotation unless the same points in the same order are already a preset
+        rotation = tuple(points)
+        for i in range(4):
+            if rotation not in presets:
+                presets.append(rotation)
+            rotation = tuple((y, -x) for x, y in rotation)
+    return tuple(presets)
+
+
+def pack_piece_presets(key, presets):
+    """
+    Returns the piece preset cache file contents of a list of piece presets
+
+    Parameters:
+        key (bytes): The hash of the shape presets the piece presets were built from
+        presets (tuple): The (x, y) tile points of each piece preset
+
+    Returns:
+        bytes: The cache file contents
+    """
+    data = bytearray(PRESET_CACHE_HEADER.pack(PRESET_CACHE_MAGIC, PRESET_CACHE_VERSION, key, len(presets)))
+    for points in presets:
+        # Each preset is its point count followed by its coordinates as signed bytes
+        data += struct.pack("<B" + "b" * len(points) * 2, len(points), *[c for point in points for c in point])
+    return bytes(data)
+
+
+def unpack_piece_presets(data, key):
+    """
+    Returns the piece presets held in piece preset cache file contents
+
+    Parameters:
+        data (bytes): The cache file contents
+        key (bytes): The hash of the shape presets the piece presets must have been built from
+
+    Returns:
+        tuple: The (x, y) tile points of each piece preset, or None if the contents are invalid or out of date
+    """
+    if len(data) < PRESET_CACHE_HEADER.size:
+        return None
+    magic, version, data_key, count = PRESET_CACHE_HEADER.unpack_from(data)
+    if magic != PRESET_CACHE_MAGIC or version != PRESET_CACHE_VERSION or data_key != key:
+        return None
+
+    presets = []
+    offset = PRESET_CACHE_HEADER.size
+    try:
+        for i in range(count):
+            point_count = data[offset]
+            coordinates = struct.unpack_from("<" + "b" * point_count * 2, data, offset + 1)
+            presets.append(tuple(zip(coordinates[::2], coordinates[1::2])))
+            offset += 1 + point_count * 2
+    except (IndexError, struct.error):
+        return None
+    return tuple(presets)
+
+
+def load_piece_presets(path):
+    """
+    Returns the piece presets of the shape presets setting, from the cache file if it is up to date
+
+    The presets are built in memory if the cache file is missing, invalid or was built from different shape presets.
+    The cache file is only ever written by write_piece_presets
+
+    Parameters:
+        path (str): The path of the cache file
+
+    Returns:
+        tuple: The (x, y) tile points of each piece preset
+    """
+    try:
+        file = open(path, "rb")
+        presets = unpack_piece_presets(file.read(), shape_presets_key(maze_piece_shape_presets))
+        file.close()
+        if presets is not None:
+            return presets
+    except OSError:
+        pass
+    return build_piece_presets(maze_piece_shape_presets)
+
+
+def write_piece_presets(path):
+    """
+    Builds the piece presets of the shape presets setting and writes them to a cache file
+
+    Parameters:
+        path (str): The path of the cache file
+
+    Returns:
+        tuple: The (x, y) tile points of each piece preset
+    """
+    presets = build_piece_presets(maze_piece_shape_presets)
+    # Write to a temporary file first so a reader never sees a partly written cache
+    temp_path = path + "." + str(os.getpid()) + ".tmp"
+    file = open(temp_path, "wb")
+    file.write(pack_piece_presets(shape_presets_key(maze_piece_shape_presets), presets))
+    file.close()
+    os.replace(temp_path, path)
+    return presets
+
+
+def preset_placements(height):
+    """
+    Returns the tiler placements of every piece preset on a grid height
+
+    Parameters:
+        height (int): The height of the grid in tiles
+
+    Returns:
+        list: The placements of each piece preset, as returned by MazeTiler.preset_placements
+    """
+    if height not in PRESET_PLACEMENTS:
+        PRESET_PLACEMENTS[height] = [MazeTiler.preset_placements([Point(x, y) for x, y in points], height)
+                                     for points in PIECE_PRESETS]
+    return PRESET_PLACEMENTS[height]
+
+
+# The piece presets and their tiler placements for each grid height, built once per process
+PIECE_PRESETS = load_piece_presets(PIECE_PRESETS_PATH)
+PRESET_PLACEMENTS = {}
+
+
+if __name__ == '__main__':
+    # Rebuild the shipped table after changing the shape presets setting
+    print("Wrote " + str(len(write_piece_presets(PIECE_PRESETS_PATH))) + " piece presets to " + PIECE_PRESETS_PATH)
@@ -0,0 +1,226 @@
+from tools import *
+
+
+class MazeTiler:
+    """
+    Places maze piece presets on a grid of tiles using integer bitmasks of the occupied tiles
+
+    Each column of tiles is an integer whose bit y is set when the tile at y is occupied. The translated column masks of
+    every preset are precomputed for every anchor tile and row, so testing whether a preset fits on a tile is an AND per
+    column the preset covers instead of a search through a list of points. The free tile counts of the columns are kept
+    in a binary indexed tree, so finding a random free tile is logarithmic in the grid size instead of linear.
+
+    ...
+
+    Attributes:
+    -----------
+    width (int): The width of the grid in tiles
+    height (int): The height of the grid in tiles
+    columns (list): The occupied tile bitmask of each column
+    free_counts (list): The number of unoccupied tiles in each column
+    free_tree (list): The binary indexed tree of the column free counts
+    free_count (int): The total number of unoccupied tiles
+    placements (list): The precomputed placements of each preset, one per anchor tile of the preset
+
+    Methods:
+    --------
+    def occupy(self, points):
+        Marks the tiles at the points as occupied
+
+    def random_free_tile(self, rng):
+        Returns a random unoccupied tile
+
+    def place(self, tile):
+        Places the first preset that fits on the tile and returns it
+
+    def occupy_column(self, x, mask, count):
+        Marks the tiles of a column mask as occupied
+
+    Static Methods:
+    ---------------
+    def preset_placements(points, height):
+        Returns the precomputed placements of a preset for every anchor tile
+
+    def nth_set_bit(mask, n, bits):
+        Returns the position of the nth lowest set bit of a mask
+    """
+
+    def __init__(self, width, height, placements):
+        """
+        Returns a new maze tiler with every tile unoccupied
+
+        Parameters:
+            width (int): The width of the grid in tiles
+            height (int): The height of the grid in tiles
+            placements (list): The precomputed placements of each preset for the grid height, in the order they should
+            be tried
+
+        Returns:
+            MazeTiler: A new maze tiler
+        """
+        self.width = width
+        self.height = height
+        self.columns = [0] * width
+        self.free_counts = [height] * width
+        self.free_count = width * height
+        # Node i of the tree holds the sum of the free counts of the columns i - (i & -i) to i - 1
+        self.free_tree = [0] + [height * (i & -i) for i in range(1, width + 1)]
+        self.placements = placements
+
+    def occupy(self, points):
+        """
+        Marks the tiles at the points as occupied
+
+        Parameters:
+            points (list): The tile points to occupy
+        """
+        for point in points:
+            bit = 1 << point.y
+            if not self.columns[point.x] & bit:
+                self.occupy_column(point.x, bit, 1)
+
+    def random_free_tile(self, rng):
+        """
+        Returns a random unoccupied tile
+
+        The tiles are numbered column by column, so the same random draw picks the same tile as choosing from a list of
+        unoccupied tile points built column by column
+
+        Parameters:
+            rng (Random): The random number generator to draw from
+
+        Returns:
+            Point: The unoccupied tile
+        """
+        index = rng.randrange(self.free_count)
+
+        # Find the column holding the tile by descending the tree
+        x = 0
+        step = 1 << self.width.bit_length()
+        while step:
+            if x + step <= self.width and self.free_tree[x + step] <= index:
+                x += step
+                index -= self.free_tree[x]
+            step >>= 1
+
+        free = ~self.columns[x] & ((1 << self.height) - 1)
+        return Point(x, MazeTiler.nth_set_bit(free, index, self.height))
+
+    def place(self, tile):
+        """
+        Places the first preset that fits on the tile and returns it
+
+        Parameters:
+            tile (Point): The tile to place a preset on
+
+        Returns:
+            tuple: The index of the placed preset and its displacement, or None if no preset fits
+        """
+        for preset_index, anchors in enumerate(self.placements):
+            for anchor, min_dx, max_dx, row_masks in anchors:
+                # Check the preset stays within the grid
+                if tile.x + min_dx < 0 or tile.x + max_dx >= self.width:
+                    continue
+                column_masks = row_masks[tile.y]
+                if column_masks is None:
+                    continue
+
+                # Check none of the covered columns are already occupied
+                fits = True
+                for dx, mask, count in column_masks:
+                    if self.columns[tile.x + dx] & mask:
+                        fits = False
+                        break
+
+                if fits:
+                    # Occupy the tiles of the preset
+                    for dx, mask, count in column_masks:
+                        self.occupy_column(tile.x + dx, mask, count)
+                    return preset_index, tile - anchor
+
+        return None
+
+    def occupy_column(self, x, mask, count):
+        """
+        Marks the tiles of a column mask as occupied
+
+        Parameters:
+            x (int): The column
+            mask (int): The mask of the tiles to occupy, which must all be unoccupied
+            count (int): The number of tiles in the mask
+        """
+        self.columns[x] |= mask
+        self.free_counts[x] -= count
+        self.free_count -= count
+
+        # Update every tree node covering the column
+        node = x + 1
+        while node <= self.width:
+            self.free_tree[node] -= count
+            node += node & -node
+
+    @staticmethod
+    def preset_placements(points, height):
+        """
+        Returns the precomputed placements of a preset for every anchor tile
+
+        Parameters:
+            points (list): The tile points of the preset
+            height (int): The height of the grid in tiles
+
+        Returns:
+            list: The (anchor, min x offset, max x offset, row masks) placement of each anchor tile, where the row masks
+            hold the (x offset, mask, tile count) of each covered column for every row, or None if out of bounds
+        """
+        placements = []
+        for anchor in points:
+            offsets = [point - anchor for point in points]
+            min_dx = min(offset.x for offset in offsets)
+            max_dx = max(offset.x for offset in offsets)
+            min_dy = min(offset.y for offset in offsets)
+            max_dy = max(offset.y for offset in offsets)
+
+            # Build the column masks with the top of the preset on bit 0
+            column_masks = {}
+            for offset in offsets:
+                column_masks[offset.x] = column_masks.get(offset.x, 0) | 1 << (offset.y - min_dy)
+
+            # Shift the column masks to every row the preset fits on
+            row_masks = []
+            for y in range(height):
+                if y + min_dy < 0 or y + max_dy >= height:
+                    row_masks.append(None)
+                else:
+                    row_masks.append(tuple((dx, mask << (y + min_dy), bin(mask).count("1"))
+                                           for dx, mask in column_masks.items()))
+            placements.append((anchor, min_dx, max_dx, row_masks))
+        return placements
+
+    @staticmethod
+    def nth_set_bit(mask, n, bits):
+        """
+        Returns the position of the nth lowest set bit of a mask
+
+        Parameters:
+            mask (int): The mask
+            n (int): The number of lower set bits to skip
+            bits (int): The number of bits in the mask
+
+        Returns:
+            int: The position of the bit
+        """
+        # Halve the bits searched each time by checking which half holds the bit
+        position = 0
+        while bits > 1:
+            half = bits // 2
+            low_mask = mask & ((1 << half) - 1)
+            low_count = bin(low_mask).count("1")
+            if n < low_count:
+                mask = low_mask
+                bits = half
+            else:
+                n -= low_count
+                mask >>= half
+                position += half
+                bits -= half
+        return position
@@ -0,0 +1,170 @@
+from maze_grid import *
+from settings import *
+
+# The bits of the left, bottom, right and top neighbours in a neighbour bitmask
+NEIGHBOUR_BITS = {direction: 1 << bit for bit, (direction, dx, dy) in enumerate(NEIGHBOUR_OFFSETS)}
+ORTHOGONAL_MASK = NEIGHBOUR_BITS["L"] | NEIGHBOUR_BITS["B"] | NEIGHBOUR_BITS["R"] | NEIGHBOUR_BITS["T"]
+
+# The number of orthogonal neighbours set in every neighbour bitmask
+DEGREE_TABLE = bytes(bin(mask & ORTHOGONAL_MASK).count("1") for mask in range(256))
+
+
+class MazeReport:
+    """
+    The connectivity and quality measures of a maze
+
+    ...
+
+    Attributes:
+    -----------
+    path_count (int): The number of path blocks
+    component_count (int): The number of separate groups of connected path blocks
+    unreachable_pickups (int): The number of pickups that can't be reached from the start point
+    dead_ends (int): The number of path blocks with at most one neighbouring path block
+    loops (int): The number of independent loops the paths make
+
+    Methods:
+    --------
+    def problems(self):
+        Returns the reasons the maze fails the quality filter
+
+    def is_valid(self):
+        Returns whether the maze passes the quality filter
+    """
+
+    def __init__(self, path_count, component_count, unreachable_pickups, dead_ends, loops):
+        """
+        Returns a new maze report
+
+        Parameters:
+            path_count (int): The number of path blocks
+            component_count (int): The number of separate groups of connected path blocks
+            unreachable_pickups (int): The number of pickups that can't be reached from the start point
+            dead_ends (int): The number of path blocks with at most one neighbouring path block
+            loops (int): The number of independent loops the paths make
+
+        Returns:
+            MazeReport: A new maze report
+        """
+        self.path_count = path_count
+        self.component_count = component_count
+        self.unreachable_pickups = unreachable_pickups
+        self.dead_ends = dead_ends
+        self.loops = loops
+
+    def __str__(self):
+        """
+        Returns the string representation of the maze report
+
+        Returns:
+            string: The string representation
+        """
+        return "MazeReport(paths=" + str(self.path_count) + ", components=" + str(self.component_count) + \
+               ", unreachable pickups=" + str(self.unreachable_pickups) + ", dead ends=" + str(self.dead_ends) + \
+               ", loops=" + str(self.loops) + ")"
+
+    def __repr__(self):
+        """
+        Returns the string representation of the maze report
+
+        Returns:
+            string: The string representation
+        """
+        return self.__str__()
+
+    def problems(self):
+        """
+        Returns the reasons the maze fails the quality filter
+
+        Returns:
+            list: The reasons, which is empty if the maze passes
+        """
+        problems = []
+        if self.component_count != 1:
+            problems.append("disconnected")
+        if self.unreachable_pickups:
+            problems.append("unreachable pickups")
+        if self.dead_ends > MAZE_MAX_DEAD_ENDS:
+            problems.append("dead ends")
+        if self.loops < MAZE_MIN_LOOPS:
+            problems.append("too few loops")
+        return problems
+
+    def is_valid(self):
+        """
+        Returns whether the maze passes the quality filter
+
+        Returns:
+            bool: Whether the maze passes
+        """
+        return not self.problems()
+
+
+def validate_maze(grid, start):
+    """
+    Measures the connectivity and quality of a maze in a single pass over its path blocks
+
+    The path blocks are joined to their left and top neighbours with a union find as the grid is scanned row by row,
+    and the degree of every block comes from its neighbour bitmask
+
+    Parameters:
+        grid (MazeGrid): The maze grid
+        start (Point): The point every pickup must be reachable from
+
+    Returns:
+        MazeReport: The measures of the maze
+    """
+    path = MazeBlockType.PATH.value
+    masks = grid.neighbour_masks(MazeBlockType.PATH)
+    degrees = masks.translate(DEGREE_TABLE)
+    left = NEIGHBOUR_BITS["L"]
+    top = NEIGHBOUR_BITS["T"]
+    stride = grid.stride
+
+    parents = list(range(len(grid.block_types)))
+
+    def find(index):
+        # Find the root of the set, halving the path to it on the way
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    path_count = 0
+    edge_count = 0
+    dead_ends = 0
+    joins = 0
+    for index in grid.indices():
+        if grid.block_types[index] != path:
+            continue
+        path_count += 1
+        edge_count += degrees[index]
+        if degrees[index] <= 1:
+            dead_ends += 1
+
+        # Join the block to the neighbours already scanned
+        mask = masks[index]
+        for neighbour_bit, neighbour in ((left, index - 1), (top, index - stride)):
+            if mask & neighbour_bit:
+                root = find(index)
+                neighbour_root = find(neighbour)
+                if root != neighbour_root:
+                    parents[root] = neighbour_root
+                    joins += 1
+
+    # Every edge was counted from both of its blocks
+    edge_count //= 2
+    component_count = path_count - joins
+
+    # Count the pickups that aren't joined to the start point
+    start_index = grid.index(start.x, start.y)
+    start_root = find(start_index) if grid.block_types[start_index] == path else None
+    no_pickup = BlockPickupType.NONE.value
+    unreachable_pickups = 0
+    for index in grid.indices():
+        if grid.block_types[index] == path and grid.pickup_types[index] != no_pickup:
+            if find(index) != start_root:
+                unreachable_pickups += 1
+
+    return MazeReport(path_count, component_count, unreachable_pickups, dead_ends,
+                      edge_count - path_count + component_count)
@@ -1,3 +1,6 @@
+import pickle
+import threading
+
 from game_state import *
 from tools import *
 from enum_types import *
@@ -7,14 +10,12 @@ class Pacman_Game(GameComponent):
 
     def __init__(self, parent, scale, screen_bounds):
         super().__init__(parent, scale)
-        self.states = {GameStateType.START_MENU: StartMenu(self, BoundScale(0.5, 0.5, 1, 1)),
-                       GameStateType.SETTING_MENU: SettingMenu(self, BoundScale(0.5, 0.5, 1, 1)),
-                       GameStateType.GAME_MENU: GameMenu(self, BoundScale(0.5, 0.5, 1, 1))}
-
-        self.child_game_components = list(self.states.values())
-
-        for component in self.child_game_components:
-            component.set_enable(False)
+        self.opaque = True
+        # The states are built the first time they are shown
+        self.state_types = {GameStateType.START_MENU: StartMenu,
+                            GameStateType.SETTING_MENU: SettingMenu,
+                            GameStateType.GAME_MENU: GameMenu}
+        self.states = {}
 
         highscore_path = os.path.join(SAVE_FILE_PATH, HIGHSCORE_FILE)
         if os.path.exists(highscore_path):
@@ -26,8 +27,22 @@ class Pacman_Game(GameComponent):
             file.close()
 
         self.current_state = None
+        self.pending_state = None
+        self.loading_text = None
+        # Decode the sounds and the game menu assets while the start menu is showing
+        self.preloader = threading.Thread(target=self.preload, name="Preloader", daemon=True)
+        self.preload_error = None
         self.on_scale(screen_bounds)
         self.set_game_state(GameStateType.START_MENU)
+        self.preloader.start()
+
+    def update(self):
+        if self.pending_state is not None and self.preloaded():
+            self.loading_text.set_enable(False)
+            state_type = self.pending_state
+            self.pending_state = None
+            self.set_game_state(state_type)
+        super().update()
 
     def set_game_state(self, state_type):
 
@@ -35,14 +50,58 @@ class Pacman_Game(GameComponent):
             self.current_state.end()
             self.current_state.set_enable(False)
 
-        new_state = self.states.get(state_type)
+        if state_type not in self.states and not self.preloaded():
+            # Show that the game is loading until the preload thread is done, then build the state
+            self.current_state = None
+            self.pending_state = state_type
+            self.get_loading_text().set_enable(True)
+            return
+
+        new_state = self.get_state(state_type)
 
         if new_state is not None:
             self.current_state = new_state
             self.current_state.set_enable(True)
             self.current_state.start()
 
+    def get_state(self, state_type):
+        state = self.states.get(state_type)
+        if state is None and state_type in self.state_types:
+            state = self.state_types[state_type](self, BoundScale(0.5, 0.5, 1, 1))
+            state.set_enable(False)
+            state.on_scale(self.bounds)
+            self.states[state_type] = state
+            self.child_game_components.append(state)
+        return state
+
+    def get_loading_text(self):
+        if self.loading_text is None:
+            self.loading_text = Text(self, BoundScale(0.5, 0.5, 0.3, 0.05), "LOADING", WHITE, FONT_NAME, 200, True)
+            self.loading_text.on_scale(self.bounds)
+            self.child_game_components.append(self.loading_text)
+        return self.loading_text
+
+    def preload(self):
+        try:
+            SoundManager.init()
+            GameMenu.preload()
+        except Exception as error:
+            # Keep the error for the game loop, as the thread would otherwise end without a word
+            self.preload_error = error
+
+    def preloaded(self):
+        if self.preloader.is_alive():
+            return False
+        # Raise the preload error on the game loop rather than building states without their assets
+        if self.preload_error is not None:
+            raise self.preload_error
+        return True
+
     def end(self):
+        # End the state being shown so it closes what it holds open
+        if self.current_state is not None:
+            self.current_state.end()
+
         highscore_path = os.path.join(SAVE_FILE_PATH, HIGHSCORE_FILE)
         file = open(highscore_path, "wb")
         pickle.dump(globals.highscore, file)
@@ -6,14 +6,34 @@ ASPECT_RATIO = 17 / 17
 START_SIZE = (1000, int(1000 // ASPECT_RATIO))
 MIN_SIZE = (400, int(400 // ASPECT_RATIO))
 FPS = 144
+# Seconds the window has to stop changing size for before the game is laid out again at the new size
+RESIZE_SETTLE_TIME = 0.2
+# Size of a fixed frame the game is rendered into and scaled up to the window, or None to render at the window size
+# (512, 512) renders the maze at 14 pixels a block, as the maze is laid out at 0.87 of the frame height
+INTERNAL_RESOLUTION = None
+# Whether the fixed frame is smoothly scaled to fill the window rather than scaled by the largest whole number that fits
+INTERNAL_RESOLUTION_SMOOTH = False
+# Memory the scaled sprites may use before the sprites of the least recently used sizes are dropped
+SPRITE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Memory the loaded assets may use before the assets no longer in use are dropped, least recently released first
+ASSET_CACHE_MAX_BYTES = 8 * 1024 * 1024
 
 # Maze generation settings
 WIDTH_TILE_COUNT = 9
 HEIGHT_TILE_COUNT = 9
 TILE_SCALE_FACTOR = 3
-MAZE_BARRIER_Y_POSITION = 11
 MAZE_WIDTH = WIDTH_TILE_COUNT * TILE_SCALE_FACTOR + 3
 MAZE_HEIGHT = HEIGHT_TILE_COUNT * TILE_SCALE_FACTOR + 3
+# Number of mazes built ahead of time on a background worker process
+MAZE_PREFETCH_COUNT = 1
+# Number of rows of walls of the next maze drawn each frame while a level finishes
+MAZE_PRERENDER_ROWS = 2
+# Number of block sizes whose pre-scaled wall tiles are kept, so resizing back to a recent size is free
+MAZE_ATLAS_CACHE_SIZE = 4
+# Maze quality filter, mazes failing it are rejected and built again
+MAZE_MAX_DEAD_ENDS = 0
+MAZE_MIN_LOOPS = 20
+MAZE_MAX_ATTEMPTS = 100
 maze_piece_shape_presets = [
     [""],
     ["L", "LU"],
@@ -38,7 +58,6 @@ POWER_PELLET_MAX_X = 8
 POINT_PICKUP_VALUE = 10
 POWER_PELLET_PICKUP_VALUE = 50
 FRUIT_PICKUP_VALUE = 400
-FRUIT_SPAWN_CHANCE = 1
 FRUIT_COOLDOWN_DURATION = 20
 
 # General game settings
@@ -109,16 +128,23 @@ GHOST_PUPIL_COLOR = BLUE
 
 # UI Settings
 FONT_NAME = "Joystix"
+# The number of glyph atlases of different fonts, colors and sizes kept in memory
+GLYPH_ATLAS_CACHE_SIZE = 8
 
 
 # Files and file paths
 
 SAVE_FILE_PATH = "Saves"
-PIECE_PRESETS_FILE = "piece_presets.pickle"
+PIECE_PRESETS_FILE = "piece_presets.bin"
 HIGHSCORE_FILE = "highscore.pickle"
 
+# Path of a maze corpus written by maze_generator.py to load levels from instead of generating them (None to generate)
+MAZE_CORPUS_FILE = None
 
-BUTTON_FILE_PATH = "Assets\\Button"
+
+ASSETS_FILE_PATH = "Assets"
+
+BUTTON_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Button")
 START_BUTTON_FILE_PATH = os.path.join(BUTTON_FILE_PATH, "Start Button")
 START_BUTTON_NORMAL_ANIMATION = (START_BUTTON_FILE_PATH, "Start_Button_Normal")
 START_BUTTON_HOVER_ANIMATION = (START_BUTTON_FILE_PATH, "Start_Button_Hover")
@@ -127,17 +153,24 @@ QUIT_BUTTON_FILE_PATH = os.path.join(BUTTON_FILE_PATH, "Quit Button")
 QUIT_BUTTON_NORMAL_ANIMATION = (QUIT_BUTTON_FILE_PATH, "Quit_Button_Normal")
 QUIT_BUTTON_HOVER_ANIMATION = (QUIT_BUTTON_FILE_PATH, "Quit_Button_Hover")
 
-GHOST_FILE_PATH = "Assets\\Entity\\Ghost"
+GHOST_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Entity", "Ghost")
 GHOST_NORMAL_ANIMATION = (GHOST_FILE_PATH, "Normal_Ghost")
 GHOST_FRIGHTENED_ANIMATION = (GHOST_FILE_PATH, "Frightened_Ghost")
 
-PACMAN_FILE_PATH = "Assets\\Entity\\Pacman"
+PACMAN_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Entity", "Pacman")
 PACMAN_MOVING_ANIMATION = (PACMAN_FILE_PATH, "Pacman_Moving")
 PACMAN_IDLE_ANIMATION = (PACMAN_FILE_PATH, "Pacman_Idle")
 PACMAN_DEATH_ANIMATION = (PACMAN_FILE_PATH, "Pacman_Death")
 
+# The animations sprite_sheets.py packs into a sheet each, and where the sheets and their manifest are written
+SPRITE_SHEET_ANIMATIONS = (START_BUTTON_NORMAL_ANIMATION, START_BUTTON_HOVER_ANIMATION, QUIT_BUTTON_NORMAL_ANIMATION,
+                           QUIT_BUTTON_HOVER_ANIMATION, GHOST_NORMAL_ANIMATION, GHOST_FRIGHTENED_ANIMATION,
+                           PACMAN_MOVING_ANIMATION, PACMAN_IDLE_ANIMATION, PACMAN_DEATH_ANIMATION)
+SPRITE_SHEET_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Sheets")
+SPRITE_SHEET_MANIFEST = "manifest.json"
+
 
-MAZE_FILE_PATH = "Assets\\Maze"
+MAZE_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Maze")
 BLOCK_WALL_IMAGES = {BlockWallType.CENTER: "Wall_Block_Center.png", BlockWallType.SIDE: "Wall_Block_Side.png",
                      BlockWallType.CORNER: "Wall_Block_Corner.png", BlockWallType.EDGE_SIDE: "Wall_Block_Edge_Side.png",
                      BlockWallType.EDGE_INNER_CORNER: "Wall_Block_Edge_Inner_Corner.png",
@@ -148,12 +181,12 @@ BLOCK_WALL_IMAGES = {BlockWallType.CENTER: "Wall_Block_Center.png", BlockWallTyp
 BLOCK_BARRIER_IMAGE = "Barrier_Block.png"
 FRUIT_IMAGE = "Fruit.png"
 
-ICON_FILE_PATH = "Assets\\Icons"
+ICON_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Icons")
 PACMAN_LIFE_ICON_IMAGE = "Pacman_Life_Icon.png"
 START_MENU_TITLE_LOGO = "Start_Menu_Title_Logo.png"
 
 
-SOUND_FILE_PATH = "Assets\\Sounds"
+SOUND_FILE_PATH = os.path.join(ASSETS_FILE_PATH, "Sounds")
 SOUND_FILES = {SoundTrack.SCARED_GHOST_SIREN: "Scared_Ghost_Siren.wav", SoundTrack.GHOST_EATEN: "Ghost_Eaten.wav",
                SoundTrack.GAME_START: "Game_Start.wav", SoundTrack.GHOST_SIREN: "Ghost_Siren.wav",
                SoundTrack.POINT_EATEN_1: "Point_Eaten_1.wav", SoundTrack.POINT_EATEN_2: "Point_Eaten_2.wav",
@@ -171,4 +204,6 @@ SOUND_VOLUME = {SoundTrack.SCARED_GHOST_SIREN: 0.5, SoundTrack.GHOST_EATEN: 1, S
 DISPLAY_BOUND_BORDER = False
 DISPLAY_MAZE_GRIDLINES = False
 DISPLAY_GHOST_TARGET = False
+# Print the memory used by every asset and its scaled sprites when the game exits
+PRINT_ASSET_MEMORY_REPORT = False
 BOUND_BORDER_COLOR = BLUE
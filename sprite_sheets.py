@@ -0,0 +1,138 @@
+import os
+
+# Keep the build quiet when it imports pygame through the game modules
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import math
+import time
+
+from settings import *
+
+MANIFEST_VERSION = 1
+
+
+def build_sprite_sheet(animation_path, sheet_path):
+    """
+    Packs the frames of an animation into a grid on one sheet image
+
+    Parameters:
+        animation_path (tuple): The directory of the frame images and the name shared by their file names
+        sheet_path (str): The path of the sheet image to write
+
+    Returns:
+        list: The [x, y, width, height] area of the sheet holding each frame, in frame order
+    """
+    frames = [pygame.image.load(path) for path in animation_files(animation_path)]
+    if not frames:
+        raise ValueError("No frames of the " + animation_path[1] + " animation in " + animation_path[0])
+
+    cell_width = max(frame.get_width() for frame in frames)
+    cell_height = max(frame.get_height() for frame in frames)
+    columns = math.ceil(math.sqrt(len(frames)))
+    rows = -(-len(frames) // columns)
+
+    sheet = pygame.Surface((columns * cell_width, rows * cell_height), flags=pygame.SRCALPHA)
+    areas = []
+    for i, frame in enumerate(frames):
+        area = [i % columns * cell_width, i // columns * cell_height, frame.get_width(), frame.get_height()]
+        # Copy the pixels as they are rather than blending them onto the transparent sheet
+        sheet.blit(frame, area[:2], special_flags=pygame.BLEND_RGBA_MAX)
+        areas.append(area)
+
+    pygame.image.save(sheet, sheet_path)
+    return areas
+
+
+def build_sprite_sheets(animations=SPRITE_SHEET_ANIMATIONS, sheet_file_path=SPRITE_SHEET_FILE_PATH):
+    """
+    Packs every animation into a sheet and writes the manifest of where each frame is
+
+    Parameters:
+        animations (tuple): The (directory, name) of each animation (Default: SPRITE_SHEET_ANIMATIONS)
+        sheet_file_path (str): The directory to write the sheets and the manifest to (Default: SPRITE_SHEET_FILE_PATH)
+
+    Returns:
+        dict: The manifest
+    """
+    os.makedirs(sheet_file_path, exist_ok=True)
+
+    manifest = {"version": MANIFEST_VERSION, "sheets": {}}
+    for animation_path in animations:
+        sheet = animation_path[1] + ".png"
+        manifest["sheets"][animation_path[1]] = {
+            "sheet": sheet, "frames": build_sprite_sheet(animation_path, os.path.join(sheet_file_path, sheet))}
+
+    file = open(os.path.join(sheet_file_path, SPRITE_SHEET_MANIFEST), "w")
+    json.dump(manifest, file)
+    file.close()
+    return manifest
+
+
+def sprite_sheet_manifest(sheet_file_path=SPRITE_SHEET_FILE_PATH):
+    """
+    Returns the manifest of the sprite sheets in a directory, reading it the first time it is asked for
+
+    Parameters:
+        sheet_file_path (str): The directory of the sheets and the manifest (Default: SPRITE_SHEET_FILE_PATH)
+
+    Returns:
+        dict: The manifest, or None if no sheets have been built
+    """
+    if sheet_file_path not in SPRITE_SHEET_MANIFESTS:
+        manifest = None
+        path = os.path.join(sheet_file_path, SPRITE_SHEET_MANIFEST)
+        if os.path.exists(path):
+            file = open(path, "r")
+            manifest = json.load(file)
+            file.close()
+            if manifest.get("version") != MANIFEST_VERSION:
+                raise ValueError(path + " is not a version " + str(MANIFEST_VERSION) + " sprite sheet manifest")
+        SPRITE_SHEET_MANIFESTS[sheet_file_path] = manifest
+    return SPRITE_SHEET_MANIFESTS[sheet_file_path]
+
+
+def load_animation(animation_path):
+    """
+    Returns the frames of an animation
+
+    If the animation has been packed into a sprite sheet the sheet is loaded with one read and the frames are
+    subsurfaces of it, otherwise every frame image is loaded on its own
+
+    Parameters:
+        animation_path (tuple): The directory of the frame images and the name shared by their file names
+
+    Returns:
+        list: The frames in order
+    """
+    manifest = sprite_sheet_manifest()
+    entry = manifest["sheets"].get(animation_path[1]) if manifest else None
+    if entry is None:
+        return load_animation_files(animation_path)
+
+    sheet = load_image(os.path.join(SPRITE_SHEET_FILE_PATH, entry["sheet"]))
+    return [sheet.subsurface(area) for area in entry["frames"]]
+
+
+# The manifest read from each sprite sheet directory, or None for directories without one
+SPRITE_SHEET_MANIFESTS = {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the frames of every animation into sprite sheets")
+    parser.add_argument("-o", "--output", default=SPRITE_SHEET_FILE_PATH,
+                        help="the directory to write the sheets and their manifest to (default: " +
+                             SPRITE_SHEET_FILE_PATH + ")")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    manifest = build_sprite_sheets(SPRITE_SHEET_ANIMATIONS, args.output)
+    elapsed = time.perf_counter() - start_time
+    frames = sum(len(entry["frames"]) for entry in manifest["sheets"].values())
+    print("Packed " + str(frames) + " frames of " + str(len(manifest["sheets"])) + " animations into " + args.output +
+          " in " + str(round(elapsed, 2)) + "s")
+
+
+if __name__ == '__main__':
+    main()
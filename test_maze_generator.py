@@ -0,0 +1,20 @@
+import sys
+
+import maze_generator
+from maze_validation import *
+
+
+def test_summary_counts_duplicates_as_candidates(monkeypatch, capsys):
+    # Nothing written, fifty mazes skipped as duplicates and two rejected for being disconnected
+    rejections = [MazeReport(100, 2, 0, 0, MAZE_MIN_LOOPS), MazeReport(100, 2, 0, 0, MAZE_MIN_LOOPS)]
+    monkeypatch.setattr(maze_generator, "run_batch", lambda *args: (0, 50, rejections))
+    monkeypatch.setattr(sys, "argv", ["maze_generator.py", "0", "52"])
+
+    maze_generator.main()
+
+    output = capsys.readouterr().out
+    assert "Generated 0 mazes" in output
+    assert "Skipped 50 duplicate mazes" in output
+    assert "Rejected 2 of 52 candidate mazes (3.85%)" in output
+    assert "    disconnected: 2" in output
+    assert "too few loops" not in output
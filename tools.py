@@ -4,16 +4,32 @@ import os
 import pygame
 
 
-def draw_image(surface, image, bounds):
-    surface.blit(pygame.transform.smoothscale(image, bounds.size()), bounds.position())
-
-
 def draw_ellipse(surface, color, center, x_radius, y_radius):
     ellipse_rect = (center.x - x_radius, center.y - y_radius, x_radius * 2, y_radius * 2)
     pygame.draw.ellipse(surface, color, ellipse_rect)
 
 
-def load_animation(animation_path):
+def convert_surface(surface, alpha=True):
+    # Nothing can be converted to the display format before the display mode is set
+    if pygame.display.get_surface() is None:
+        return surface
+    if alpha:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def create_surface(size, alpha=True):
+    if alpha:
+        return convert_surface(pygame.Surface(size, flags=pygame.SRCALPHA))
+    return convert_surface(pygame.Surface(size), False)
+
+
+def load_image(path):
+    image = pygame.image.load(path)
+    return convert_surface(image, bool(image.get_flags() & pygame.SRCALPHA))
+
+
+def animation_files(animation_path):
 
     def frame_num(file_name):
         frame_num = int("".join(filter(str.isdigit, file_name)))
@@ -31,10 +47,11 @@ def load_animation(animation_path):
 
     files.sort(key=frame_num)
 
-    frames = []
-    for file in files:
-        frames.append(pygame.image.load(os.path.join(file_path, file)))
-    return frames
+    return [os.path.join(file_path, file) for file in files]
+
+
+def load_animation_files(animation_path):
+    return [load_image(path) for path in animation_files(animation_path)]
 
 
 def add_text_digit_padding(text, padding):
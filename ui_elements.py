@@ -1,5 +1,10 @@
+import string
+import threading
+from collections import OrderedDict
+
 from animation import Animator
 from game_component import *
+from managers import *
 from tools import *
 
 
@@ -25,6 +30,7 @@ class Button(GameComponent):
         self.animator.add_animation(normal)
         self.animator.add_animation(hover)
         self.animator.add_animation(clicked)
+        self.drawn_frame = None
 
     def start(self):
         self.current_state = ButtonState.NORMAL
@@ -42,7 +48,7 @@ class Button(GameComponent):
         super().process_event(event)
 
     def update(self):
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = Display.mouse_position()
         if self.bounds.is_within(mouse_pos[0], mouse_pos[1]):
             if not self.current_state == ButtonState.CLICKED:
                 self.current_state = ButtonState.HOVER
@@ -58,15 +64,92 @@ class Button(GameComponent):
         self.animator.update()
         super().update()
 
+    def on_scale(self, container_bounds):
+        super().on_scale(container_bounds)
+        SpriteCache.prepare(self.animator.get_frames(), self.as_bounds.size())
+        self.drawn_frame = None
+
     def draw(self):
+        # Only draw again when the animation has moved to another frame
+        if self.animator.get_current_frame() is self.drawn_frame:
+            return
+        self.drawn_frame = self.animator.get_current_frame()
+
         self.surface.fill(EMPTY)
         image_bounds = self.as_bounds.copy()
         image_bounds.x = 0
         image_bounds.y = 0
-        draw_image(self.surface, self.animator.get_current_frame(), image_bounds)
+        SpriteCache.draw(self.surface, self.drawn_frame, image_bounds)
+        self.mark_dirty()
         super().draw()
 
 
+class GlyphAtlas:
+
+    fonts = {}
+    font_lock = threading.Lock()
+    atlases = OrderedDict()
+
+    def __init__(self, font_name, size, color, height=None):
+        self.font = GlyphAtlas.get_font(font_name, size)
+        self.color = color
+        self.height = self.font.get_height() if height is None else height
+        self.scaled = height is not None
+        self.glyphs = {}
+
+    def get_glyph(self, char):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self.font.render(char, False, self.color)
+            if self.scaled:
+                width = round(glyph.get_width() * self.height / glyph.get_height())
+                glyph = pygame.transform.scale(glyph, (width, self.height))
+            glyph = convert_surface(glyph, False)
+            self.glyphs[char] = glyph
+        return glyph
+
+    def prepare(self, chars):
+        for char in set(chars):
+            self.get_glyph(char)
+
+    def get_text_width(self, text):
+        return sum(self.get_glyph(char).get_width() for char in text)
+
+    def draw(self, surface, text, position):
+        x, y = position
+        glyphs = []
+        for char in text:
+            glyph = self.get_glyph(char)
+            glyphs.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(glyphs, False)
+
+    @staticmethod
+    def get_font(font_name, size):
+        key = (font_name, size)
+        # The fonts are also looked up on the preload thread
+        with GlyphAtlas.font_lock:
+            font = GlyphAtlas.fonts.get(key)
+            if font is None:
+                font = pygame.font.SysFont(font_name, size)
+                GlyphAtlas.fonts[key] = font
+        return font
+
+    @staticmethod
+    def get_atlas(font_name, size, color, height=None):
+        key = (font_name, size, tuple(color), height)
+        atlas = GlyphAtlas.atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font_name, size, color, height)
+            GlyphAtlas.atlases[key] = atlas
+            # Drop the least recently used atlas
+            if len(GlyphAtlas.atlases) > GLYPH_ATLAS_CACHE_SIZE:
+                GlyphAtlas.atlases.popitem(last=False)
+        else:
+            GlyphAtlas.atlases.move_to_end(key)
+        return atlas
+
+
 class Text(GameComponent):
 
     def __init__(self, parent, scale, text, color, font_name, size, fit_to_area):
@@ -76,7 +159,8 @@ class Text(GameComponent):
         self.font_name = font_name
         self.size = size
         self.fit_to_area = fit_to_area
-        self.text_surface = None
+        self.atlas = GlyphAtlas.get_atlas(font_name, size, color)
+        self.container_bounds = None
         self.render()
 
     def start(self):
@@ -85,28 +169,43 @@ class Text(GameComponent):
 
     def on_scale(self, container_bounds):
         super().on_scale(container_bounds)
+        self.container_bounds = container_bounds
+        if self.fit_to_area:
+            self.atlas = GlyphAtlas.get_atlas(self.font_name, self.size, self.color, self.as_bounds.height)
+            self.atlas.prepare(self.text + string.digits)
+            # Fit the area to the glyphs so the text can be drawn without scaling it
+            width = self.atlas.get_text_width(self.text)
+            if self.text and width != self.as_bounds.width:
+                self.as_bounds.x += (self.as_bounds.width - width) // 2
+                self.as_bounds.width = width
+                self.surface = create_surface(self.as_bounds.size())
+        else:
+            self.atlas = GlyphAtlas.get_atlas(self.font_name, self.size, self.color)
+            self.atlas.prepare(self.text + string.digits)
         self.draw_surface()
 
     def draw_surface(self):
         self.surface.fill(EMPTY)
-        text_image = None
-        if self.fit_to_area:
-            text_image = pygame.transform.scale(self.text_surface, self.as_bounds.size())
-        else:
-            text_image = self.text_surface
-
-        self.surface.blit(text_image, (0, 0))
+        self.atlas.draw(self.surface, self.text, (0, 0))
+        self.mark_dirty()
 
     def render(self):
-        self.text_surface = pygame.font.SysFont(self.font_name, self.size).render(self.text, False, self.color)
         if self.fit_to_area:
-            self.aspect_ratio = self.text_surface.get_width() / self.text_surface.get_height()
+            atlas = GlyphAtlas.get_atlas(self.font_name, self.size, self.color)
+            self.aspect_ratio = atlas.get_text_width(self.text) / atlas.height
 
     def set_text(self, new_text):
         if new_text != self.text:
             self.text = new_text
             self.render()
-            self.draw_surface()
+            if self.fit_to_area and self.text and self.container_bounds is not None and \
+                    self.atlas.get_text_width(self.text) != self.as_bounds.width:
+                # The glyphs no longer fill the fitted area, so fit it again to keep drawing them unscaled
+                if self.parent is not None:
+                    self.parent.mark_dirty(self.as_bounds)
+                self.on_scale(self.container_bounds)
+            else:
+                self.draw_surface()
 
 
 class IconBar(GameComponent):
@@ -127,6 +226,7 @@ class IconBar(GameComponent):
         self.surface.fill(EMPTY)
         for i in range(self.current_num):
             self.surface.blit(self.scaled_image, (i*self.scaled_image.get_width(), 0))
+        self.mark_dirty()
 
     def on_scale(self, container_bounds):
         super().on_scale(container_bounds)
@@ -154,6 +254,7 @@ class Icon(GameComponent):
     def draw_surface(self):
         self.surface.fill(EMPTY)
         self.surface.blit(self.scaled_image, (0, 0))
+        self.mark_dirty()
 
     def on_scale(self, container_bounds):
         super().on_scale(container_bounds)